@@ -1,12 +1,22 @@
 """Adapter for FinBot backend API calls used by the Dash frontend."""
 
+import json
 import os
+import threading
+import time
+import uuid
+from collections.abc import Iterator
 
 import requests
 
 
 API_BASE_URL = os.getenv("FINBOT_API_URL", "http://finbot-api:8080").rstrip("/")
 API_TIMEOUT_SECONDS = 300
+STREAM_RETENTION_SECONDS = 600
+
+# In-process buffers for answers being streamed, keyed by stream ID
+_STREAMS: dict[str, dict] = {}
+_STREAMS_LOCK = threading.Lock()
 
 
 def is_api_healthy() -> bool:
@@ -34,6 +44,96 @@ def get_completed_message(
         return None
 
 
+def stream_completed_message(
+    input_string: str, timeout: int = API_TIMEOUT_SECONDS
+) -> Iterator[str]:
+    """Call the streaming completion endpoint and yield answer tokens as they arrive.
+
+    Raises:
+        requests.RequestException: When the backend fails or reports an error.
+    """
+    with requests.get(
+        f"{API_BASE_URL}/complete_message/stream",
+        params={"input_string": input_string},
+        stream=True,
+        timeout=timeout,
+    ) as response:
+        response.raise_for_status()
+        event = None
+        for line in response.iter_lines(decode_unicode=True):
+            if not line:
+                event = None
+            elif line.startswith("event:"):
+                event = line[len("event:") :].strip()
+                if event == "done":
+                    return
+            elif line.startswith("data:"):
+                data = json.loads(line[len("data:") :])
+                if event == "error":
+                    raise requests.RequestException(data.get("error"))
+                if data.get("token"):
+                    yield data["token"]
+
+
+def _consume_stream(stream_id: str, input_string: str) -> None:
+    """Read a streamed answer into its buffer until it completes or fails."""
+    try:
+        for token in stream_completed_message(input_string):
+            with _STREAMS_LOCK:
+                _STREAMS[stream_id]["text"] += token
+    except (requests.RequestException, ValueError, TypeError):
+        with _STREAMS_LOCK:
+            _STREAMS[stream_id]["error"] = True
+    finally:
+        with _STREAMS_LOCK:
+            _STREAMS[stream_id]["done"] = True
+            _STREAMS[stream_id]["finished_at"] = time.time()
+
+
+def start_completed_message_stream(input_string: str) -> str:
+    """Start streaming an answer in the background and return its stream ID."""
+    stream_id = uuid.uuid4().hex
+    with _STREAMS_LOCK:
+        # Drop buffers of finished streams nobody polled, e.g. closed browser tabs
+        expired = [
+            key
+            for key, stream in _STREAMS.items()
+            if stream["done"]
+            and time.time() - stream["finished_at"] > STREAM_RETENTION_SECONDS
+        ]
+        for key in expired:
+            del _STREAMS[key]
+        _STREAMS[stream_id] = {
+            "text": "",
+            "done": False,
+            "error": False,
+            "finished_at": 0.0,
+        }
+
+    threading.Thread(
+        target=_consume_stream, args=(stream_id, input_string), daemon=True
+    ).start()
+    return stream_id
+
+
+def get_stream_progress(stream_id: str | None) -> dict | None:
+    """Return the text received so far and the done/error flags of a stream.
+
+    Finished streams are released after being read once.
+    """
+    with _STREAMS_LOCK:
+        stream = _STREAMS.get(stream_id)
+        if stream is None:
+            return None
+        if stream["done"]:
+            del _STREAMS[stream_id]
+        return {
+            "text": stream["text"],
+            "done": stream["done"],
+            "error": stream["error"],
+        }
+
+
 def get_reddit_posts_count() -> int | None:
     """Fetch the current number of reddit posts available in backend context."""
     try:
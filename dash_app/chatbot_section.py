@@ -19,6 +19,8 @@ def get_content() -> html.Div:
         style={"height": "90%"},
         children=[
             dcc.Store(id="chat-history", data=[]),
+            dcc.Store(id="chat-stream-id", data=None),
+            dcc.Interval(id="chat-stream-interval", interval=250, disabled=True),
             html.Div(
                 className="chat-container",
                 children=[
@@ -81,6 +83,8 @@ clientside_callback(
         "chat_history": Output("chat-history", "data"),
         "loading_overlay": Output("loading-overlay", "visible"),
         "new_value": Output("user-input", "value"),
+        "stream_id": Output("chat-stream-id", "data"),
+        "stream_disabled": Output("chat-stream-interval", "disabled"),
     },
     inputs={
         "_": Input("send-btn", "n_clicks"),
@@ -92,8 +96,8 @@ clientside_callback(
 )
 def update_chat(
     _: int | None, user_input: str, chat_history: list[str]
-) -> dict[str, list[str] | bool | str]:
-    """Update the chat history with user input and bot response.
+) -> dict[str, list[str] | bool | str | None]:
+    """Update the chat history with user input and start streaming the bot response.
 
     Args:
         _: Unused click event trigger.
@@ -101,10 +105,17 @@ def update_chat(
         chat_history: List of previous chat messages.
 
     Returns:
-        dict: Updated chat history, loading state, and cleared input value.
+        dict: Updated chat history, loading state, cleared input value, and the
+        stream ID polled by poll_chat_stream.
     """
+    no_stream = {"stream_id": None, "stream_disabled": True}
     if not user_input:
-        return {"chat_history": chat_history, "loading_overlay": False, "new_value": ""}
+        return {
+            "chat_history": chat_history,
+            "loading_overlay": False,
+            "new_value": "",
+            **no_stream,
+        }
 
     chat_history.append(f"**You:** \n{user_input}\n")
 
@@ -116,17 +127,81 @@ def update_chat(
         chat_history.append(
             "**Bot:** \nBackend API is unavailable right now. Please retry in a few seconds.\n"
         )
-        return {"chat_history": chat_history, "loading_overlay": False, "new_value": ""}
+        return {
+            "chat_history": chat_history,
+            "loading_overlay": False,
+            "new_value": "",
+            **no_stream,
+        }
+
+    stream_id = finbot_adapter.start_completed_message_stream(chat_history_only_user)
+    chat_history.append("**Bot:** \n...\n")
+    return {
+        "chat_history": chat_history,
+        "loading_overlay": True,
+        "new_value": "",
+        "stream_id": stream_id,
+        "stream_disabled": False,
+    }
+
+
+@dash.callback(
+    output={
+        "chat_history": Output("chat-history", "data", allow_duplicate=True),
+        "loading_overlay": Output("loading-overlay", "visible", allow_duplicate=True),
+        "stream_disabled": Output(
+            "chat-stream-interval", "disabled", allow_duplicate=True
+        ),
+    },
+    inputs={
+        "_": Input("chat-stream-interval", "n_intervals"),
+        "stream_id": State("chat-stream-id", "data"),
+        "chat_history": State("chat-history", "data"),
+    },
+    state={},
+    prevent_initial_call=True,
+)
+def poll_chat_stream(
+    _: int, stream_id: str | None, chat_history: list[str]
+) -> dict[str, list[str] | bool]:
+    """Render the partial bot answer received so far for the active stream.
+
+    Args:
+        _: Unused interval trigger.
+        stream_id: ID of the stream started by update_chat.
+        chat_history: List of previous chat messages, ending with the bot answer.
+
+    Returns:
+        dict: Chat history with the latest partial answer, loading state, and
+        whether polling should stop.
+    """
+    progress = finbot_adapter.get_stream_progress(stream_id)
+    if progress is None:
+        return {
+            "chat_history": dash.no_update,
+            "loading_overlay": False,
+            "stream_disabled": True,
+        }
+
+    response_text = progress["text"]
+    if progress["done"] and (progress["error"] or not response_text):
+        response_text = (
+            response_text + "\n\n" if response_text else ""
+        ) + "Sorry, there was an error processing your request."
 
-    response_text = finbot_adapter.get_completed_message(chat_history_only_user)
     if not response_text:
-        chat_history.append(
-            "**Bot:** \nSorry, there was an error processing your request.\n"
-        )
-        return {"chat_history": chat_history, "loading_overlay": False, "new_value": ""}
+        return {
+            "chat_history": dash.no_update,
+            "loading_overlay": True,
+            "stream_disabled": False,
+        }
 
-    chat_history.append(f"**Bot:** \n{response_text}\n")
-    return {"chat_history": chat_history, "loading_overlay": False, "new_value": ""}
+    chat_history[-1] = f"**Bot:** \n{response_text}\n"
+    return {
+        "chat_history": chat_history,
+        "loading_overlay": False,
+        "stream_disabled": progress["done"],
+    }
 
 
 @dash.callback(
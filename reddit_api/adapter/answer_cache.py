@@ -0,0 +1,108 @@
+"""Semantic cache of chat answers keyed by question embeddings."""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+
+import numpy as np
+
+from logger_config import logger
+
+ANSWER_CACHE_THRESHOLD = float(os.getenv("ANSWER_CACHE_THRESHOLD", "0.92"))
+ANSWER_CACHE_TTL_SECONDS = float(os.getenv("ANSWER_CACHE_TTL_SECONDS", "86400"))
+ANSWER_CACHE_SIZE = int(os.getenv("ANSWER_CACHE_SIZE", "1000"))
+
+
+class SemanticAnswerCache:
+    """Thread-safe answer cache matching questions by cosine similarity.
+
+    Entries expire after ttl_seconds and the least recently used entry is
+    evicted once maxsize is reached.
+    """
+
+    def __init__(
+        self,
+        threshold: float = ANSWER_CACHE_THRESHOLD,
+        ttl_seconds: float = ANSWER_CACHE_TTL_SECONDS,
+        maxsize: int = ANSWER_CACHE_SIZE,
+    ) -> None:
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self.maxsize = max(maxsize, 1)
+        self.hits = 0
+        self.misses = 0
+        # question -> (unit vector, answer, stored_at)
+        self._entries: OrderedDict[str, tuple[np.ndarray, str, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _normalize(vector: np.ndarray) -> np.ndarray:
+        """Return vector scaled to unit length so a dot product is the cosine."""
+        vector = np.asarray(vector, dtype="float32")
+        norm = float(np.linalg.norm(vector))
+        return vector / norm if norm > 0 else vector
+
+    def _evict_expired(self) -> None:
+        """Drop expired entries. Caller must hold the lock."""
+        now = time.time()
+        expired = [
+            question
+            for question, (_, _, stored_at) in self._entries.items()
+            if now - stored_at > self.ttl_seconds
+        ]
+        for question in expired:
+            del self._entries[question]
+
+    def lookup(self, vector: np.ndarray) -> str | None:
+        """Return the answer of the most similar past question above the threshold."""
+        query = self._normalize(vector)
+        with self._lock:
+            self._evict_expired()
+            if not self._entries:
+                self.misses += 1
+                return None
+
+            questions = list(self._entries)
+            matrix = np.stack([self._entries[question][0] for question in questions])
+            similarities = matrix @ query
+            best = int(np.argmax(similarities))
+            if float(similarities[best]) < self.threshold:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self._entries.move_to_end(questions[best])
+            logger.info(
+                "Answer cache hit similarity=%.3f", float(similarities[best])
+            )
+            return self._entries[questions[best]][1]
+
+    def store(self, vector: np.ndarray, question: str, answer: str) -> None:
+        """Remember the answer to a question."""
+        if not answer.strip():
+            return
+        with self._lock:
+            self._entries[question] = (self._normalize(vector), answer, time.time())
+            self._entries.move_to_end(question)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> dict[str, float]:
+        """Return hit/miss counters and the current configuration."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "size": len(self._entries),
+                "threshold": self.threshold,
+            }
+
+
+@lru_cache(maxsize=1)
+def get_answer_cache() -> SemanticAnswerCache:
+    """Get the process-wide answer cache."""
+    return SemanticAnswerCache()
@@ -0,0 +1,139 @@
+"""Micro-batching embedder sharing one encode call between concurrent queries."""
+
+import asyncio
+import concurrent.futures
+import os
+import queue
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+from logger_config import logger
+
+EMBED_BATCH_MAX_SIZE = int(os.getenv("EMBED_BATCH_MAX_SIZE", "64"))
+EMBED_BATCH_MAX_WAIT_MS = float(os.getenv("EMBED_BATCH_MAX_WAIT_MS", "5"))
+# Recent query embeddings kept so the answer-cache lookup and retrieval of
+# one question share a single encode
+EMBED_RECENT_CACHE_SIZE = int(os.getenv("EMBED_RECENT_CACHE_SIZE", "256"))
+
+
+class MicroBatchEmbedder:
+    """Collect texts arriving within a few milliseconds and encode them together.
+
+    A dedicated daemon thread owns the model, so callers on the event loop only
+    await a future and never run the forward pass themselves. Embeddings of
+    recent texts are returned from a small LRU without being queued; they are
+    read-only arrays.
+    """
+
+    def __init__(
+        self,
+        model,
+        max_batch_size: int = EMBED_BATCH_MAX_SIZE,
+        max_wait_ms: float = EMBED_BATCH_MAX_WAIT_MS,
+        recent_cache_size: int = EMBED_RECENT_CACHE_SIZE,
+    ) -> None:
+        self.model = model
+        self.max_batch_size = max(max_batch_size, 1)
+        self.max_wait_seconds = max(max_wait_ms, 0.0) / 1000
+        self._queue: queue.Queue = queue.Queue()
+        self.recent_cache_size = max(recent_cache_size, 0)
+        self._recent: OrderedDict[str, np.ndarray] = OrderedDict()
+        self._recent_lock = threading.Lock()
+        self._thread = threading.Thread(
+            target=self._worker, name="micro-batch-embedder", daemon=True
+        )
+        self._thread.start()
+
+    def submit(self, text: str) -> concurrent.futures.Future:
+        """Queue a text and return a future resolving to its embedding."""
+        future: concurrent.futures.Future = concurrent.futures.Future()
+        with self._recent_lock:
+            vector = self._recent.get(text)
+            if vector is not None:
+                self._recent.move_to_end(text)
+        if vector is not None:
+            future.set_result(vector)
+        else:
+            self._queue.put((text, future))
+        return future
+
+    def _remember(self, texts: list[str], vectors: list[np.ndarray]) -> None:
+        """Keep freshly encoded vectors in the LRU of recent texts."""
+        if not self.recent_cache_size:
+            return
+        with self._recent_lock:
+            for text, vector in zip(texts, vectors):
+                self._recent[text] = vector
+                self._recent.move_to_end(text)
+            while len(self._recent) > self.recent_cache_size:
+                self._recent.popitem(last=False)
+
+    def embed(self, text: str) -> np.ndarray:
+        """Embed a text, blocking the calling thread until its batch is encoded."""
+        return self.submit(text).result()
+
+    async def aembed(self, text: str) -> np.ndarray:
+        """Embed a text without blocking the event loop."""
+        return await asyncio.wrap_future(self.submit(text))
+
+    def _collect_batch(self) -> list[tuple[str, concurrent.futures.Future]]:
+        """Wait for one item, then gather more until the batch fills or time is up."""
+        batch = [self._queue.get()]
+        deadline = time.perf_counter() + self.max_wait_seconds
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _worker(self) -> None:
+        """Encode batches forever, resolving each caller's future."""
+        while True:
+            # Drop requests whose caller went away (e.g. a disconnected client)
+            batch = [
+                (text, future)
+                for text, future in self._collect_batch()
+                if future.set_running_or_notify_cancel()
+            ]
+            if not batch:
+                continue
+            texts = [text for text, _ in batch]
+            try:
+                vectors = self.model.encode(
+                    texts, convert_to_numpy=True, show_progress_bar=False
+                )
+            except Exception as error:  # noqa: BLE001
+                logger.exception("Embedding batch of %d texts failed", len(texts))
+                for _, future in batch:
+                    _resolve(future, error=error)
+                continue
+
+            # Read-only, as the same array may be handed to several callers
+            vectors = [np.array(vector) for vector in vectors]
+            for vector in vectors:
+                vector.setflags(write=False)
+            self._remember(texts, vectors)
+            for (_, future), vector in zip(batch, vectors):
+                _resolve(future, result=vector)
+
+
+def _resolve(
+    future: concurrent.futures.Future,
+    result: np.ndarray | None = None,
+    error: BaseException | None = None,
+) -> None:
+    """Set a future's outcome; a future that cannot take it must not stop the worker."""
+    try:
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+    except concurrent.futures.InvalidStateError:
+        logger.warning("Dropped embedding result of an already resolved request")
@@ -0,0 +1,315 @@
+"""Pipelined bulk (re)indexing of Reddit posts into the vector store.
+
+Three stages overlap instead of running one after the other per batch:
+
+* a reader thread fetches post batches from the DAO (skipping indexed posts),
+* a process pool chunks and encodes them, one embedding model per process,
+* a writer thread upserts the finished batches into the vector store.
+
+Stages are connected by bounded queues, so a slow stage applies backpressure
+instead of buffering the whole corpus in memory.
+
+Run from the reddit_api folder:
+    python -m adapter.bulk_indexer --rebuild
+"""
+
+import argparse
+import collections
+import concurrent.futures
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from typing import Any
+
+from dao import DAO
+from logger_config import logger
+from adapter import chunking, vector_db_adapter
+
+BULK_INDEX_BATCH_SIZE = int(os.getenv("BULK_INDEX_BATCH_SIZE", "256"))
+BULK_INDEX_WORKERS = int(
+    os.getenv("BULK_INDEX_WORKERS", str(max((os.cpu_count() or 2) - 1, 1)))
+)
+BULK_INDEX_QUEUE_DEPTH = int(os.getenv("BULK_INDEX_QUEUE_DEPTH", "4"))
+_DONE = object()
+
+# Per-process state of the encoder pool, set by _init_encoder
+_WORKER_MODEL = None
+_WORKER_TOKENIZER = None
+_WORKER_CACHE = None
+
+
+def _init_encoder(backend: str, threads: int) -> None:
+    """Load the embedding model once in each encoder process.
+
+    Encoder processes only read the embedding cache; the writer thread of the
+    parent process adds the new vectors.
+    """
+    # pylint: disable=global-statement
+    global _WORKER_MODEL, _WORKER_TOKENIZER, _WORKER_CACHE
+    # Processes share the cores, so each one keeps its own math threads low
+    os.environ["OMP_NUM_THREADS"] = str(threads)
+    if backend == "torch":
+        import torch  # pylint: disable=import-outside-toplevel
+
+        torch.set_num_threads(threads)
+    _WORKER_MODEL = vector_db_adapter.load_embedding_model(backend)
+    _WORKER_TOKENIZER = chunking.build_chunk_tokenizer(_WORKER_MODEL.tokenizer)
+    _WORKER_CACHE = vector_db_adapter.get_embedding_cache()
+
+
+def _encode_posts(posts: list[tuple[str, str]], post_metadata: dict) -> dict:
+    """Chunk and embed one batch of posts inside an encoder process."""
+    return vector_db_adapter.embed_posts(
+        _WORKER_MODEL, _WORKER_TOKENIZER, posts, _WORKER_CACHE, post_metadata
+    )
+
+
+class BulkIndexer:
+    """Reader, encoder pool and writer stages of one bulk indexing run.
+
+    Attributes:
+        store: Vector store receiving the chunks.
+        batch_size: Posts per DAO fetch and per encode task.
+        workers: Encoder processes.
+        queue_depth: Batches buffered between two stages.
+    """
+
+    def __init__(
+        self,
+        store: Any,
+        batch_size: int = BULK_INDEX_BATCH_SIZE,
+        workers: int = BULK_INDEX_WORKERS,
+        queue_depth: int = BULK_INDEX_QUEUE_DEPTH,
+    ) -> None:
+        self.store = store
+        self.batch_size = max(batch_size, 1)
+        self.workers = max(workers, 1)
+        self.queue_depth = max(queue_depth, 1)
+        self._stop = threading.Event()
+        self._errors: list[BaseException] = []
+
+    def _put(self, target: queue.Queue, item: Any) -> bool:
+        """Put into a bounded queue unless the run is being stopped."""
+        while not self._stop.is_set():
+            try:
+                target.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _fail(self, error: BaseException) -> None:
+        """Record a stage failure and stop the other stages."""
+        self._errors.append(error)
+        self._stop.set()
+
+    def _read(
+        self, dao: DAO, post_ids: list[str], skip_existing: bool, out: queue.Queue
+    ) -> None:
+        """Fetch batches of posts not yet in the store, with their metadata."""
+        try:
+            for start in range(0, len(post_ids), self.batch_size):
+                if self._stop.is_set():
+                    return
+                batch_ids = post_ids[start : start + self.batch_size]
+                new_ids = batch_ids
+                if skip_existing:
+                    existing = self.store.existing_ids(
+                        [chunking.make_chunk_id(post_id, 0) for post_id in batch_ids]
+                    )
+                    new_ids = [
+                        post_id
+                        for post_id in batch_ids
+                        if chunking.make_chunk_id(post_id, 0) not in existing
+                    ]
+                posts = dao.get_reddit_posts_by_ids(new_ids) if new_ids else []
+                metadata = dao.get_reddit_posts_metadata(new_ids) if posts else {}
+                if not self._put(out, (len(batch_ids), posts, metadata)):
+                    return
+        except Exception as error:  # noqa: BLE001
+            self._fail(error)
+        finally:
+            self._put(out, _DONE)
+
+    def _write(self, source: queue.Queue, counters: dict) -> None:
+        """Upsert encoded batches, index them in BM25 and report progress."""
+        cache = vector_db_adapter.get_embedding_cache()
+        lexical_index = vector_db_adapter.get_lexical_index()
+        while True:
+            item = source.get()
+            if item is _DONE:
+                return
+            if self._stop.is_set():
+                continue  # Drain so the encoder stage never blocks on a full queue
+            scanned, post_count, entries = item
+            try:
+                if entries["ids"]:
+                    self.store.upsert(**entries)
+                    lexical_index.add(entries["ids"], entries["documents"])
+                    if cache is not None:
+                        cache.add(entries["documents"], entries["embeddings"])
+            except Exception as error:  # noqa: BLE001
+                self._fail(error)
+                continue
+            counters["posts"] += post_count
+            counters["chunks"] += len(entries["ids"])
+            vector_db_adapter.SYNC_PROGRESS.advance(
+                scanned, post_count, len(entries["ids"])
+            )
+
+    def run(self, dao: DAO, post_ids: list[str], skip_existing: bool = True) -> dict:
+        """Index the given posts and return counts and throughput.
+
+        Returns:
+            Dict with posts, chunks, seconds and posts_per_second.
+        """
+        fetched: queue.Queue = queue.Queue(maxsize=self.queue_depth)
+        encoded: queue.Queue = queue.Queue(maxsize=self.queue_depth)
+        counters = {"posts": 0, "chunks": 0}
+        start = time.perf_counter()
+
+        reader = threading.Thread(
+            target=self._read,
+            args=(dao, post_ids, skip_existing, fetched),
+            name="bulk-index-reader",
+            daemon=True,
+        )
+        writer = threading.Thread(
+            target=self._write,
+            args=(encoded, counters),
+            name="bulk-index-writer",
+            daemon=True,
+        )
+        reader.start()
+        writer.start()
+
+        threads = max((os.cpu_count() or 1) // self.workers, 1)
+        # spawn: the parent holds threads and DB connections that must not fork
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_encoder,
+            initargs=(vector_db_adapter.EMBEDDING_BACKEND, threads),
+        ) as pool:
+            in_flight: collections.deque = collections.deque()
+            try:
+                while not self._stop.is_set():
+                    try:
+                        item = fetched.get(timeout=0.5)
+                    except queue.Empty:
+                        continue
+                    if item is _DONE:
+                        break
+                    scanned, posts, metadata = item
+                    if not posts:
+                        vector_db_adapter.SYNC_PROGRESS.advance(scanned)
+                        continue
+                    future = pool.submit(_encode_posts, posts, metadata)
+                    in_flight.append((scanned, len(posts), future))
+                    # Two tasks per process keep every core busy between batches
+                    while len(in_flight) >= 2 * self.workers:
+                        self._forward(in_flight.popleft(), encoded)
+                while in_flight and not self._stop.is_set():
+                    self._forward(in_flight.popleft(), encoded)
+            except Exception as error:  # noqa: BLE001
+                self._fail(error)
+            finally:
+                for _, _, future in in_flight:
+                    future.cancel()
+                encoded.put(_DONE)
+                writer.join()
+                reader.join()
+
+        if self._errors:
+            raise self._errors[0]
+
+        seconds = time.perf_counter() - start
+        stats = {
+            "posts": counters["posts"],
+            "chunks": counters["chunks"],
+            "seconds": seconds,
+            "posts_per_second": counters["posts"] / seconds if seconds else 0.0,
+        }
+        logger.info(
+            "Bulk indexing completed: posts=%d chunks=%d in %.1f s (%.1f posts/s)",
+            stats["posts"],
+            stats["chunks"],
+            stats["seconds"],
+            stats["posts_per_second"],
+        )
+        return stats
+
+    def _forward(self, task: tuple, encoded: queue.Queue) -> None:
+        """Wait for one encode task and hand its result to the writer."""
+        scanned, post_count, future = task
+        self._put(encoded, (scanned, post_count, future.result()))
+
+
+def rebuild_vector_index(
+    rebuild: bool = False,
+    batch_size: int = BULK_INDEX_BATCH_SIZE,
+    workers: int = BULK_INDEX_WORKERS,
+) -> dict:
+    """Index every post missing from the vector store with the bulk pipeline.
+
+    Args:
+        rebuild: Clear the vector store first and re-encode the whole corpus.
+        batch_size: Posts per DAO fetch and per encode task.
+        workers: Encoder processes.
+
+    Returns:
+        Counts and throughput of the run, see BulkIndexer.run.
+    """
+    lock = vector_db_adapter.SYNC_LOCK
+    if not lock.acquire(blocking=False):  # pylint: disable=consider-using-with
+        raise RuntimeError("A vector sync is already running")
+
+    progress = vector_db_adapter.SYNC_PROGRESS
+    try:
+        progress.start("rebuild" if rebuild else "bulk")
+        dao = DAO.get_instance()
+        store = vector_db_adapter.get_vector_store()
+        # Taken before the scan so posts inserted meanwhile are caught next sync
+        latest_mark = dao.get_latest_insertion_mark()
+        post_ids = dao.get_reddit_post_ids()
+        progress.set_total(len(post_ids))
+        if rebuild:
+            logger.info("Clearing %s vector store", vector_db_adapter.VECTOR_BACKEND)
+            store.clear()
+            vector_db_adapter.get_lexical_index().clear()
+
+        stats = BulkIndexer(store, batch_size, workers).run(
+            dao, post_ids, skip_existing=not rebuild
+        )
+        if latest_mark is not None:
+            store.set_watermark(latest_mark)
+        store.save()
+        vector_db_adapter.get_lexical_index().save()
+        store.refresh_count()
+        progress.finish()
+        return stats
+    except Exception as error:
+        progress.finish(error=str(error))
+        raise
+    finally:
+        lock.release()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk index posts into vectors")
+    parser.add_argument(
+        "--rebuild",
+        action="store_true",
+        help="clear the vector store and re-encode every post",
+    )
+    parser.add_argument("--batch-size", type=int, default=BULK_INDEX_BATCH_SIZE)
+    parser.add_argument("--workers", type=int, default=BULK_INDEX_WORKERS)
+    args = parser.parse_args()
+    result = rebuild_vector_index(args.rebuild, args.batch_size, args.workers)
+    print(
+        f"posts={result['posts']} chunks={result['chunks']}"
+        f" seconds={result['seconds']:.1f}"
+        f" posts_per_second={result['posts_per_second']:.1f}"
+    )
@@ -0,0 +1,77 @@
+"""Split Reddit threads into overlapping, token-bounded chunks for embedding."""
+
+import os
+
+from tokenizers import Tokenizer
+
+CHUNK_MAX_TOKENS = int(os.getenv("CHUNK_MAX_TOKENS", "128"))
+CHUNK_OVERLAP_TOKENS = int(os.getenv("CHUNK_OVERLAP_TOKENS", "32"))
+CHUNK_ID_SEPARATOR = "#"
+# [CLS] and [SEP] are added by the model on top of the chunk tokens
+SPECIAL_TOKENS = 2
+
+
+def make_chunk_id(post_id: str, index: int) -> str:
+    """Build the vector store ID of one chunk of a post."""
+    return f"{post_id}{CHUNK_ID_SEPARATOR}{index}"
+
+
+def post_id_from_chunk_id(chunk_id: str) -> str:
+    """Return the post ID a chunk belongs to."""
+    return chunk_id.rsplit(CHUNK_ID_SEPARATOR, 1)[0]
+
+
+def chunk_index_from_chunk_id(chunk_id: str) -> int:
+    """Return the position of a chunk inside its post."""
+    _, _, index = chunk_id.rpartition(CHUNK_ID_SEPARATOR)
+    return int(index) if index.isdigit() else 0
+
+
+def build_chunk_tokenizer(model_tokenizer) -> Tokenizer:
+    """Return an untruncated copy of the embedding model's fast tokenizer.
+
+    Accepts either a transformers fast tokenizer (SentenceTransformer backend)
+    or a tokenizers.Tokenizer (ONNX backend).
+    """
+    backend = getattr(model_tokenizer, "backend_tokenizer", model_tokenizer)
+    tokenizer = Tokenizer.from_str(backend.to_str())
+    tokenizer.no_truncation()
+    tokenizer.no_padding()
+    return tokenizer
+
+
+def chunk_posts(
+    posts: list[tuple[str, str]],
+    tokenizer: Tokenizer,
+    max_tokens: int = CHUNK_MAX_TOKENS,
+    overlap_tokens: int = CHUNK_OVERLAP_TOKENS,
+) -> list[tuple[str, str, str]]:
+    """Split posts into overlapping chunks that fit the embedding model window.
+
+    Args:
+        posts: (post_id, content) tuples.
+        tokenizer: Tokenizer from build_chunk_tokenizer.
+        max_tokens: Model window including special tokens.
+        overlap_tokens: Tokens shared by consecutive chunks.
+
+    Returns:
+        (chunk_id, post_id, chunk_text) tuples, in post then chunk order.
+    """
+    window = max(max_tokens - SPECIAL_TOKENS, 1)
+    stride = max(window - overlap_tokens, 1)
+    encodings = tokenizer.encode_batch(
+        [content for _, content in posts], add_special_tokens=False
+    )
+
+    chunks = []
+    for (post_id, content), encoding in zip(posts, encodings):
+        offsets = encoding.offsets
+        if len(offsets) <= window:
+            chunks.append((make_chunk_id(post_id, 0), post_id, content))
+            continue
+
+        for index, start in enumerate(range(0, len(offsets) - overlap_tokens, stride)):
+            end = min(start + window, len(offsets))
+            text = content[offsets[start][0] : offsets[end - 1][1]]
+            chunks.append((make_chunk_id(post_id, index), post_id, text))
+    return chunks
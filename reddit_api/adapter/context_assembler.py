@@ -0,0 +1,119 @@
+"""Token-budgeted assembly of the Reddit facts sent in the final-answer prompt."""
+
+import os
+from functools import lru_cache
+
+import numpy as np
+import tiktoken
+
+from logger_config import logger
+from adapter import vector_db_adapter
+
+CONTEXT_TOKEN_BUDGET = int(os.getenv("CONTEXT_TOKEN_BUDGET", "1200"))
+CONTEXT_DEDUP_THRESHOLD = float(os.getenv("CONTEXT_DEDUP_THRESHOLD", "0.92"))
+# BPE encoding used to count prompt tokens
+CONTEXT_TOKEN_ENCODING = os.getenv("CONTEXT_TOKEN_ENCODING", "o200k_base")
+BULLET_PREFIXES = ("- ", "* ", "• ")
+
+
+@lru_cache(maxsize=1)
+def get_token_encoding() -> tiktoken.Encoding:
+    """Get the shared tokenizer used to measure the context."""
+    return tiktoken.get_encoding(CONTEXT_TOKEN_ENCODING)
+
+
+def count_tokens(text: str) -> int:
+    """Return the number of tokens of a text."""
+    return len(get_token_encoding().encode(text, disallowed_special=()))
+
+
+def split_facts(responses: list[str]) -> list[str]:
+    """Split per-post extractions into single facts, in retrieval order."""
+    facts = []
+    for response in responses:
+        for line in response.split("\n"):
+            fact = line.strip()
+            for prefix in BULLET_PREFIXES:
+                fact = fact.removeprefix(prefix)
+            if fact.strip():
+                facts.append(fact.strip())
+    return facts
+
+
+class ContextAssembler:
+    """Rank, deduplicate and pack extracted facts into a token budget.
+
+    Facts are ranked by cosine similarity with the question, ties keeping the
+    retrieval order. A fact too close to an already kept one is dropped, and
+    facts are added best first while they fit the budget.
+
+    Attributes:
+        embedding_model: Model with a SentenceTransformer-like encode.
+        token_budget: Maximum tokens of the assembled context.
+        dedup_threshold: Cosine similarity above which two facts are duplicates.
+    """
+
+    def __init__(
+        self,
+        embedding_model,
+        token_budget: int = CONTEXT_TOKEN_BUDGET,
+        dedup_threshold: float = CONTEXT_DEDUP_THRESHOLD,
+    ) -> None:
+        self.embedding_model = embedding_model
+        self.token_budget = max(token_budget, 0)
+        self.dedup_threshold = dedup_threshold
+
+    def _embed(self, texts: list[str]) -> np.ndarray:
+        """Embed texts as unit vectors."""
+        vectors = self.embedding_model.encode(
+            texts, convert_to_numpy=True, show_progress_bar=False
+        ).astype("float32")
+        return vectors / np.clip(
+            np.linalg.norm(vectors, axis=1, keepdims=True), 1e-9, None
+        )
+
+    def assemble(self, question: str, responses: list[str]) -> str:
+        """Return the facts to put in the prompt as a bullet list."""
+        facts = split_facts(responses)
+        if not facts:
+            return ""
+
+        vectors = self._embed([question] + facts)
+        question_vector, fact_vectors = vectors[0], vectors[1:]
+        relevance = fact_vectors @ question_vector
+        order = sorted(range(len(facts)), key=lambda i: (-relevance[i], i))
+
+        kept: list[int] = []
+        used_tokens = 0
+        duplicates = 0
+        over_budget = 0
+        for i in order:
+            if kept and float((fact_vectors[kept] @ fact_vectors[i]).max()) >= (
+                self.dedup_threshold
+            ):
+                duplicates += 1
+                continue
+            tokens = count_tokens(f"- {facts[i]}\n")
+            if used_tokens + tokens > self.token_budget:
+                over_budget += 1
+                continue
+            kept.append(i)
+            used_tokens += tokens
+
+        logger.info(
+            "Context assembly: kept %d/%d facts, %d duplicates, %d over budget, "
+            "%d/%d tokens",
+            len(kept),
+            len(facts),
+            duplicates,
+            over_budget,
+            used_tokens,
+            self.token_budget,
+        )
+        return "\n".join(f"- {facts[i]}" for i in kept)
+
+
+@lru_cache(maxsize=1)
+def get_context_assembler() -> ContextAssembler:
+    """Get the shared assembler, reusing the retrieval embedding model."""
+    return ContextAssembler(vector_db_adapter.get_embedding_model())
@@ -0,0 +1,199 @@
+"""Persistent embedding cache keyed by (model name, sha256 of the text).
+
+Vectors are appended to a float32 matrix read through a memory map, and the
+sha256 digest of each row's text is appended to a parallel key file. Vectors
+are written before their key, so a key on disk always has a complete row.
+Appends are serialized across processes with an exclusive file lock.
+"""
+
+import contextlib
+import fcntl
+import hashlib
+import json
+import os
+import threading
+
+import numpy as np
+
+from logger_config import logger
+
+VECTORS_FILE = "vectors.f32"
+KEYS_FILE = "keys.bin"
+META_FILE = "meta.json"
+LOCK_FILE = ".lock"
+DIGEST_SIZE = 32
+
+
+def text_digest(text: str) -> bytes:
+    """Return the cache key of a text."""
+    return hashlib.sha256(text.encode("utf-8")).digest()
+
+
+class EmbeddingCache:
+    """On-disk embedding store of one model.
+
+    Attributes:
+        cache_dir: Folder holding the files of this model.
+        model_name: Embedding model the vectors come from.
+        dim: Vector size, known once the first vectors are added.
+    """
+
+    def __init__(self, root_dir: str, model_name: str) -> None:
+        self.model_name = model_name
+        self.cache_dir = os.path.join(root_dir, model_name)
+        self.dim: int | None = None
+        self._lock = threading.Lock()
+        self._rows: dict[bytes, int] = {}
+        self._row_count = 0
+        self._matrix: np.ndarray | None = None
+        os.makedirs(self.cache_dir, exist_ok=True)
+        with self._file_lock():
+            self._read_new_keys()
+        logger.info(
+            "Embedding cache for model=%s holds %d vectors", model_name, len(self._rows)
+        )
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.cache_dir, name)
+
+    @contextlib.contextmanager
+    def _file_lock(self):
+        """Hold the cross-process lock of the cache."""
+        with open(self._path(LOCK_FILE), mode="a", encoding="utf-8") as file:
+            fcntl.flock(file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(file, fcntl.LOCK_UN)
+
+    def _read_new_keys(self) -> None:
+        """Load keys appended since the last read, e.g. by another process."""
+        if self.dim is None and os.path.exists(self._path(META_FILE)):
+            with open(self._path(META_FILE), mode="r", encoding="utf-8") as file:
+                meta = json.load(file)
+            if meta["model"] != self.model_name:
+                raise ValueError(
+                    f"Embedding cache in {self.cache_dir} belongs to {meta['model']}"
+                )
+            self.dim = meta["dim"]
+        if self.dim is None or not os.path.exists(self._path(KEYS_FILE)):
+            return
+
+        # Only rows whose key and vector are both complete are trusted
+        row_bytes = self.dim * 4
+        complete_rows = min(
+            os.path.getsize(self._path(KEYS_FILE)) // DIGEST_SIZE,
+            os.path.getsize(self._path(VECTORS_FILE)) // row_bytes,
+        )
+        known_rows = self._row_count
+        if complete_rows <= known_rows:
+            return
+        with open(self._path(KEYS_FILE), mode="rb") as file:
+            file.seek(known_rows * DIGEST_SIZE)
+            data = file.read((complete_rows - known_rows) * DIGEST_SIZE)
+        for offset in range(0, len(data), DIGEST_SIZE):
+            self._rows.setdefault(
+                data[offset : offset + DIGEST_SIZE], known_rows + offset // DIGEST_SIZE
+            )
+        self._row_count = complete_rows
+
+    def _vectors(self, needed_rows: int) -> np.ndarray:
+        """Return the memory-mapped matrix, remapping it once the file has grown."""
+        if self._matrix is None or self._matrix.shape[0] < needed_rows:
+            rows = os.path.getsize(self._path(VECTORS_FILE)) // (self.dim * 4)
+            self._matrix = np.memmap(
+                self._path(VECTORS_FILE),
+                dtype="float32",
+                mode="r",
+                shape=(rows, self.dim),
+            )
+        return self._matrix
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def lookup(self, texts: list[str]) -> tuple[np.ndarray | None, list[int]]:
+        """Return cached vectors of texts and the positions that missed.
+
+        Returns:
+            (vectors, missing): vectors has one row per text, zero for misses,
+            or is None when nothing is cached yet.
+        """
+        with self._lock:
+            if self.dim is None or not self._rows:
+                return None, list(range(len(texts)))
+
+            rows = [self._rows.get(text_digest(text)) for text in texts]
+            hits = [row for row in rows if row is not None]
+            vectors = np.zeros((len(texts), self.dim), dtype="float32")
+            if hits:
+                matrix = self._vectors(max(hits) + 1)
+                found = [i for i, row in enumerate(rows) if row is not None]
+                vectors[found] = matrix[hits]
+        return vectors, [i for i, row in enumerate(rows) if row is None]
+
+    def add(self, texts: list[str], vectors: np.ndarray) -> int:
+        """Append vectors of texts not cached yet; return how many were added."""
+        vectors = np.asarray(vectors, dtype="float32")
+        if not texts:
+            return 0
+
+        with self._lock, self._file_lock():
+            if self.dim is None:
+                self.dim = int(vectors.shape[1])
+                with open(self._path(META_FILE), mode="w", encoding="utf-8") as file:
+                    json.dump({"model": self.model_name, "dim": self.dim}, file)
+            self._read_new_keys()
+
+            new_rows: dict[bytes, int] = {}
+            for i, text in enumerate(texts):
+                digest = text_digest(text)
+                if digest not in self._rows and digest not in new_rows:
+                    new_rows[digest] = i
+            if not new_rows:
+                return 0
+
+            # Drop a partial tail left by an interrupted append
+            row_count = self._row_count
+            for name, row_bytes in (
+                (VECTORS_FILE, self.dim * 4),
+                (KEYS_FILE, DIGEST_SIZE),
+            ):
+                with open(self._path(name), mode="ab") as file:
+                    file.truncate(row_count * row_bytes)
+            with open(self._path(VECTORS_FILE), mode="ab") as file:
+                file.write(vectors[list(new_rows.values())].tobytes())
+                file.flush()
+                os.fsync(file.fileno())
+            with open(self._path(KEYS_FILE), mode="ab") as file:
+                file.write(b"".join(new_rows))
+            for offset, digest in enumerate(new_rows):
+                self._rows[digest] = row_count + offset
+            self._row_count += len(new_rows)
+        return len(new_rows)
+
+
+def encode_with_cache(
+    model, texts: list[str], cache: EmbeddingCache | None
+) -> np.ndarray:
+    """Encode texts, reading cached vectors and encoding only the misses.
+
+    New vectors are not added to the cache here, so read-only callers such as
+    encoder processes can use it; call cache.add once they are stored.
+    """
+    if cache is None:
+        return model.encode(
+            texts, convert_to_numpy=True, show_progress_bar=False
+        ).astype("float32")
+
+    vectors, missing = cache.lookup(texts)
+    if not missing:
+        return vectors
+
+    encoded = model.encode(
+        [texts[i] for i in missing], convert_to_numpy=True, show_progress_bar=False
+    ).astype("float32")
+    if vectors is None:
+        return encoded
+    vectors[missing] = encoded
+    return vectors
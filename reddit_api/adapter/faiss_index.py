@@ -0,0 +1,517 @@
+"""In-process FAISS index of Reddit post (chunk) embeddings, persisted to disk."""
+
+import json
+import os
+import threading
+from collections.abc import Callable
+from datetime import datetime
+
+import faiss
+import numpy as np
+
+from dao import DAO
+from logger_config import logger
+
+INDEX_FILE = "index.faiss"
+IDS_FILE = "ids.json"
+METADATA_FILE = "metadata.json"
+DOCUMENTS_FILE = "documents.json"
+WATERMARK_FILE = "watermark.json"
+FAISS_IVF_NLIST = int(os.getenv("FAISS_IVF_NLIST", "256"))
+FAISS_IVF_NPROBE = int(os.getenv("FAISS_IVF_NPROBE", "16"))
+# Around 39 training points per list are needed for stable centroids; FAISS
+# samples at most 256 per list when training
+IVF_MIN_POINTS_PER_LIST = 39
+IVF_MAX_POINTS_PER_LIST = 256
+FAISS_HNSW_M = int(os.getenv("FAISS_HNSW_M", "32"))
+FAISS_HNSW_EF_SEARCH = int(os.getenv("FAISS_HNSW_EF_SEARCH", "64"))
+
+
+def _load_post_documents(post_ids: list[str]) -> dict[str, str]:
+    """Read whole post contents from the DAO."""
+    return dict(DAO.get_instance().get_reddit_posts_by_ids(post_ids))
+
+
+def _compare(value, condition) -> bool:
+    """Evaluate one Chroma field condition, e.g. {"$gte": 10} or a plain value."""
+    if not isinstance(condition, dict):
+        return value == condition
+    operator, expected = next(iter(condition.items()))
+    if value is None:
+        return operator == "$ne"
+    checks = {
+        "$eq": lambda: value == expected,
+        "$ne": lambda: value != expected,
+        "$gt": lambda: value > expected,
+        "$gte": lambda: value >= expected,
+        "$lt": lambda: value < expected,
+        "$lte": lambda: value <= expected,
+        "$in": lambda: value in expected,
+        "$nin": lambda: value not in expected,
+    }
+    if operator not in checks:
+        raise ValueError(f"Unsupported metadata filter operator={operator}")
+    return checks[operator]()
+
+
+class MetadataIndex:
+    """Inverted index of entry metadata answering Chroma-style where filters.
+
+    Each (key, value) pair maps to the positions holding it; numeric values
+    are also kept sorted per key so range conditions are binary searches.
+    """
+
+    def __init__(self) -> None:
+        self._count = 0
+        self._values: dict[str, dict] = {}
+        self._ranges: dict[str, tuple[np.ndarray, np.ndarray]] = {}
+
+    def add(self, position: int, metadata: dict) -> None:
+        """Index the metadata of the entry at position (positions only grow)."""
+        for key, value in metadata.items():
+            self._values.setdefault(key, {}).setdefault(value, []).append(position)
+            self._ranges.pop(key, None)
+        self._count = position + 1
+
+    def _equal(self, key: str, value) -> np.ndarray:
+        positions = self._values.get(key, {}).get(value, [])
+        return np.asarray(positions, dtype="int64")
+
+    def _all(self) -> np.ndarray:
+        return np.arange(self._count, dtype="int64")
+
+    def _having(self, key: str) -> np.ndarray:
+        """Return the positions with any value for key."""
+        positions = [p for group in self._values.get(key, {}).values() for p in group]
+        return np.unique(np.asarray(positions, dtype="int64"))
+
+    def _range(self, key: str) -> tuple[np.ndarray, np.ndarray]:
+        """Return the numeric values of key, sorted, with their positions."""
+        if key not in self._ranges:
+            pairs = [
+                (value, position)
+                for value, positions in self._values.get(key, {}).items()
+                if isinstance(value, (int, float)) and not isinstance(value, bool)
+                for position in positions
+            ]
+            pairs.sort()
+            self._ranges[key] = (
+                np.asarray([value for value, _ in pairs], dtype="float64"),
+                np.asarray([position for _, position in pairs], dtype="int64"),
+            )
+        return self._ranges[key]
+
+    def _field(self, key: str, condition) -> np.ndarray:
+        """Return the sorted positions matching one field condition."""
+        if not isinstance(condition, dict):
+            return self._equal(key, condition)
+        operator, expected = next(iter(condition.items()))
+        if operator == "$eq":
+            return self._equal(key, expected)
+        if operator == "$ne":
+            return np.setdiff1d(self._all(), self._equal(key, expected))
+        if operator in ("$in", "$nin"):
+            matched = np.unique(
+                np.concatenate(
+                    [self._equal(key, value) for value in expected]
+                    or [np.zeros(0, dtype="int64")]
+                )
+            )
+            if operator == "$in":
+                return matched
+            return np.setdiff1d(self._having(key), matched)
+        values, positions = self._range(key)
+        bounds = {
+            "$gt": (np.searchsorted(values, expected, side="right"), len(values)),
+            "$gte": (np.searchsorted(values, expected, side="left"), len(values)),
+            "$lt": (0, np.searchsorted(values, expected, side="left")),
+            "$lte": (0, np.searchsorted(values, expected, side="right")),
+        }
+        if operator not in bounds:
+            raise ValueError(f"Unsupported metadata filter operator={operator}")
+        start, end = bounds[operator]
+        return np.sort(positions[start:end])
+
+    def positions(self, where: dict) -> np.ndarray:
+        """Return the sorted positions whose metadata satisfy where."""
+        result = None
+        for key, condition in where.items():
+            if key == "$and":
+                parts = [self.positions(part) for part in condition]
+                matched = parts[0] if parts else self._all()
+                for part in parts[1:]:
+                    matched = np.intersect1d(matched, part, assume_unique=True)
+            elif key == "$or":
+                matched = np.unique(
+                    np.concatenate(
+                        [self.positions(part) for part in condition]
+                        or [np.zeros(0, dtype="int64")]
+                    )
+                )
+            else:
+                matched = self._field(key, condition)
+            result = (
+                matched
+                if result is None
+                else np.intersect1d(result, matched, assume_unique=True)
+            )
+        return self._all() if result is None else result
+
+
+def matches_where(metadata: dict, where: dict) -> bool:
+    """Return whether metadata satisfies a Chroma-style where filter."""
+    for key, condition in where.items():
+        if key == "$and":
+            if not all(matches_where(metadata, part) for part in condition):
+                return False
+        elif key == "$or":
+            if not any(matches_where(metadata, part) for part in condition):
+                return False
+        elif not _compare(metadata.get(key), condition):
+            return False
+    return True
+
+
+def _ivf_nlist(vector_count: int) -> int:
+    """Return the number of IVF lists a training set of vector_count supports."""
+    return max(1, min(FAISS_IVF_NLIST, vector_count // IVF_MIN_POINTS_PER_LIST))
+
+
+class FaissPostIndex:
+    """FAISS index of post embeddings with the same calls as the Chroma handle.
+
+    Vectors live in FAISS at sequential positions and ``ids.json`` maps each
+    position back to its entry ID; ``metadata.json`` keeps the metadata of
+    each position, indexed in memory for where filters, and
+    ``documents.json`` the chunk texts returned by search. load_documents is
+    only used for indexes saved before texts were stored. On startup the index
+    is memory-mapped; it is loaded fully in memory only when new posts must be
+    added.
+
+    Attributes:
+        index_dir: Folder holding index.faiss and ids.json.
+        index_type: "flat" (exact), "ivf" or "hnsw"; all use L2 like Chroma.
+    """
+
+    def __init__(
+        self,
+        index_dir: str,
+        index_type: str = "flat",
+        load_documents: Callable[[list[str]], dict[str, str]] | None = None,
+    ) -> None:
+        self.index_dir = index_dir
+        self.load_documents = load_documents or _load_post_documents
+        self.index_type = index_type.lower()
+        if self.index_type not in ("flat", "ivf", "hnsw"):
+            raise ValueError(f"Unknown FAISS index type={index_type}")
+        self._lock = threading.Lock()
+        self._index = None
+        self._ids: list[str] = []
+        self._positions: dict[str, int] = {}
+        self._metadata: list[dict] = []
+        self._metadata_index = MetadataIndex()
+        self._documents: list[str | None] = []
+        self._mmapped = False
+        self._watermark: tuple[datetime, str] | None = None
+        self._load()
+
+    @property
+    def _index_path(self) -> str:
+        return os.path.join(self.index_dir, INDEX_FILE)
+
+    @property
+    def _ids_path(self) -> str:
+        return os.path.join(self.index_dir, IDS_FILE)
+
+    @property
+    def _metadata_path(self) -> str:
+        return os.path.join(self.index_dir, METADATA_FILE)
+
+    @property
+    def _documents_path(self) -> str:
+        return os.path.join(self.index_dir, DOCUMENTS_FILE)
+
+    @property
+    def _watermark_path(self) -> str:
+        return os.path.join(self.index_dir, WATERMARK_FILE)
+
+    def _load(self) -> None:
+        """Memory-map the persisted index when one exists."""
+        if not (os.path.exists(self._index_path) and os.path.exists(self._ids_path)):
+            logger.info("No FAISS index found in %s, starting empty", self.index_dir)
+            return
+
+        try:
+            self._index = faiss.read_index(
+                self._index_path, faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY
+            )
+            self._mmapped = True
+        except RuntimeError:
+            # Not every index type supports mmap, e.g. HNSW graphs
+            self._index = faiss.read_index(self._index_path)
+            self._mmapped = False
+        with open(self._ids_path, mode="r", encoding="utf-8") as file:
+            self._ids = json.load(file)
+        self._positions = {entry_id: i for i, entry_id in enumerate(self._ids)}
+        self._metadata = [{} for _ in self._ids]
+        if os.path.exists(self._metadata_path):
+            with open(self._metadata_path, mode="r", encoding="utf-8") as file:
+                self._metadata = json.load(file)
+        for position, metadata in enumerate(self._metadata):
+            self._metadata_index.add(position, metadata)
+        self._documents = [None for _ in self._ids]
+        if os.path.exists(self._documents_path):
+            with open(self._documents_path, mode="r", encoding="utf-8") as file:
+                self._documents = json.load(file)
+        else:
+            logger.warning(
+                "FAISS index in %s has no chunk texts, they will be rebuilt from "
+                "the database on each search until the index is rebuilt",
+                self.index_dir,
+            )
+        if os.path.exists(self._watermark_path):
+            with open(self._watermark_path, mode="r", encoding="utf-8") as file:
+                data = json.load(file)
+            self._watermark = (
+                datetime.fromisoformat(data["date_insertion"]),
+                data["post_id"],
+            )
+        self._configure_search()
+        logger.info(
+            "Loaded FAISS %s index with %d vectors (mmap=%s)",
+            self.index_type,
+            len(self._ids),
+            self._mmapped,
+        )
+
+    def _configure_search(self) -> None:
+        """Apply search-time parameters of the index type."""
+        if self.index_type == "ivf":
+            faiss.extract_index_ivf(self._index).nprobe = FAISS_IVF_NPROBE
+        elif self.index_type == "hnsw":
+            self._index.hnsw.efSearch = FAISS_HNSW_EF_SEARCH
+
+    def _create_index(self, vectors: np.ndarray):
+        """Create an empty index of the configured type, training IVF on vectors."""
+        dim = vectors.shape[1]
+        if self.index_type == "flat":
+            return faiss.IndexFlatL2(dim)
+        if self.index_type == "hnsw":
+            return faiss.IndexHNSWFlat(dim, FAISS_HNSW_M)
+
+        index = faiss.IndexIVFFlat(
+            faiss.IndexFlatL2(dim), dim, _ivf_nlist(len(vectors))
+        )
+        index.train(vectors)
+        return index
+
+    def _retrain_ivf_if_outgrown(self) -> None:
+        """Retrain IVF centroids once the corpus supports twice as many lists.
+
+        The first centroids come from the first upserted batch, which can be a
+        few posts of an incremental sync. The new ones are trained on a random
+        sample of every indexed vector, re-added in position order.
+        """
+        if self.index_type != "ivf":
+            return
+        trained_nlist = faiss.extract_index_ivf(self._index).nlist
+        nlist = _ivf_nlist(self._index.ntotal)
+        if nlist <= trained_nlist or nlist < min(2 * trained_nlist, FAISS_IVF_NLIST):
+            return
+
+        faiss.extract_index_ivf(self._index).make_direct_map()
+        vectors = self._index.reconstruct_n(0, self._index.ntotal)
+        sample = vectors[
+            np.random.default_rng(0).choice(
+                len(vectors),
+                min(len(vectors), nlist * IVF_MAX_POINTS_PER_LIST),
+                replace=False,
+            )
+        ]
+        index = self._create_index(sample)
+        index.add(vectors)
+        self._index = index
+        self._configure_search()
+        logger.info(
+            "Retrained FAISS IVF index from nlist=%d to nlist=%d on %d vectors",
+            trained_nlist,
+            nlist,
+            len(sample),
+        )
+
+    def count(self) -> int:
+        """Return the number of indexed posts."""
+        return len(self._ids)
+
+    def refresh_count(self) -> int:
+        """Return the number of indexed posts (always current for FAISS)."""
+        return self.count()
+
+    def get_watermark(self) -> tuple[datetime, str] | None:
+        """Return the (date_insertion, post_id) mark of the last synced post."""
+        return self._watermark
+
+    def set_watermark(self, watermark: tuple[datetime, str]) -> None:
+        """Move the sync watermark; it is written to disk with the index by save."""
+        self._watermark = watermark
+
+    def existing_ids(self, ids: list[str]) -> set[str]:
+        """Return the IDs already present in the index."""
+        return {post_id for post_id in ids if post_id in self._positions}
+
+    def upsert(
+        self,
+        ids: list[str],
+        documents: list[str],
+        embeddings: np.ndarray,
+        metadatas: list[dict] | None = None,
+    ) -> None:
+        """Add vectors of posts not yet indexed; known IDs are skipped."""
+        vectors = np.asarray(embeddings, dtype="float32")
+        keep = [i for i, post_id in enumerate(ids) if post_id not in self._positions]
+        if not keep:
+            return
+
+        with self._lock:
+            if self._index is None:
+                self._index = self._create_index(vectors[keep])
+                self._configure_search()
+            elif self._mmapped:
+                # A memory-mapped index is read-only, reload it before writing
+                self._index = faiss.read_index(self._index_path)
+                self._mmapped = False
+                self._configure_search()
+            self._index.add(vectors[keep])
+            for i in keep:
+                position = len(self._ids)
+                metadata = metadatas[i] if metadatas else {}
+                self._positions[ids[i]] = position
+                self._ids.append(ids[i])
+                self._metadata.append(metadata)
+                self._metadata_index.add(position, metadata)
+                self._documents.append(documents[i])
+            self._retrain_ivf_if_outgrown()
+
+    def clear(self) -> None:
+        """Drop every vector and the watermark; save removes the files."""
+        with self._lock:
+            self._index = None
+            self._ids = []
+            self._positions = {}
+            self._metadata = []
+            self._metadata_index = MetadataIndex()
+            self._documents = []
+            self._mmapped = False
+            self._watermark = None
+
+    def save(self) -> None:
+        """Persist the index and ID map atomically, or remove them once cleared."""
+        with self._lock:
+            if self._index is None:
+                for path in (
+                    self._index_path,
+                    self._ids_path,
+                    self._metadata_path,
+                    self._documents_path,
+                    self._watermark_path,
+                ):
+                    if os.path.exists(path):
+                        os.remove(path)
+                return
+            os.makedirs(self.index_dir, exist_ok=True)
+            faiss.write_index(self._index, self._index_path + ".tmp")
+            with open(self._ids_path + ".tmp", mode="w", encoding="utf-8") as file:
+                json.dump(self._ids, file)
+            with open(
+                self._metadata_path + ".tmp", mode="w", encoding="utf-8"
+            ) as file:
+                json.dump(self._metadata, file)
+            with open(
+                self._documents_path + ".tmp", mode="w", encoding="utf-8"
+            ) as file:
+                json.dump(self._documents, file)
+            os.replace(self._index_path + ".tmp", self._index_path)
+            os.replace(self._ids_path + ".tmp", self._ids_path)
+            os.replace(self._metadata_path + ".tmp", self._metadata_path)
+            os.replace(self._documents_path + ".tmp", self._documents_path)
+            if self._watermark is not None:
+                date_insertion, post_id = self._watermark
+                with open(self._watermark_path, mode="w", encoding="utf-8") as file:
+                    json.dump(
+                        {
+                            "date_insertion": date_insertion.isoformat(),
+                            "post_id": post_id,
+                        },
+                        file,
+                    )
+        logger.info("Saved FAISS index with %d vectors", len(self._ids))
+
+    def _search_parameters(self, positions: np.ndarray):
+        """Build search parameters restricting the search to positions."""
+        selector = faiss.IDSelectorBatch(len(positions), faiss.swig_ptr(positions))
+        if self.index_type == "ivf":
+            return faiss.SearchParametersIVF(sel=selector, nprobe=FAISS_IVF_NPROBE)
+        if self.index_type == "hnsw":
+            return faiss.SearchParametersHNSW(
+                sel=selector, efSearch=FAISS_HNSW_EF_SEARCH
+            )
+        return faiss.SearchParameters(sel=selector)
+
+    def search_ids(
+        self, vector: np.ndarray, k: int, where: dict | None = None
+    ) -> list[str]:
+        """Return the IDs of the k nearest entries, matching where if given."""
+        if self._index is None or k <= 0:
+            return []
+
+        query = np.asarray(vector, dtype="float32").reshape(1, -1)
+        with self._lock:
+            if where is None:
+                _, positions = self._index.search(query, min(k, len(self._ids)))
+            else:
+                # Pre-filter: FAISS only visits positions whose metadata match
+                allowed = np.ascontiguousarray(
+                    self._metadata_index.positions(where), dtype="int64"
+                )
+                if len(allowed) == 0:
+                    return []
+                _, positions = self._index.search(
+                    query,
+                    min(k, len(allowed)),
+                    params=self._search_parameters(allowed),
+                )
+        return [self._ids[position] for position in positions[0] if position >= 0]
+
+    def documents(self, ids: list[str], where: dict | None = None) -> dict[str, str]:
+        """Return the stored texts of entry IDs matching where.
+
+        Entries saved without their text fall back to load_documents.
+        """
+        texts, missing = {}, []
+        with self._lock:
+            for entry_id in ids:
+                position = self._positions.get(entry_id)
+                if position is None or (
+                    where is not None
+                    and not matches_where(self._metadata[position], where)
+                ):
+                    continue
+                if self._documents[position] is None:
+                    missing.append(entry_id)
+                else:
+                    texts[entry_id] = self._documents[position]
+        if missing:
+            texts.update(self.load_documents(missing))
+        return texts
+
+    def search(
+        self, vector: np.ndarray, k: int, where: dict | None = None
+    ) -> list[tuple[str, str]]:
+        """Return (entry_id, document) of the k nearest entries, nearest first."""
+        entry_ids = self.search_ids(vector, k, where)
+        documents = self.documents(entry_ids)
+        return [
+            (entry_id, documents[entry_id])
+            for entry_id in entry_ids
+            if entry_id in documents
+        ]
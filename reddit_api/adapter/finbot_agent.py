@@ -3,16 +3,86 @@
 import os
 import asyncio
 import concurrent.futures
-from typing import Annotated
-
-from typing_extensions import TypedDict
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Annotated, AsyncIterator
+
+import httpx
+from typing_extensions import NotRequired, TypedDict
+from langchain_core.messages import AIMessage
+from langchain_core.runnables import RunnableLambda
 from langchain_openai import ChatOpenAI
 from langgraph.graph import StateGraph, START
 from langgraph.graph.message import add_messages
-from tenacity import Retrying, retry_if_exception, stop_after_attempt, wait_exponential
+from tenacity import (
+    AsyncRetrying,
+    Retrying,
+    retry_if_exception,
+    stop_after_attempt,
+    wait_exponential,
+)
 from dotenv import load_dotenv
 from logger_config import logger
-from adapter import vector_db_adapter
+from adapter import context_assembler, vector_db_adapter
+
+DEFAULT_MODEL = "nvidia/nemotron-3-super-120b-a12b:free"
+DEFAULT_BASE_URL = "https://openrouter.ai/api/v1"
+LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", "64"))
+LLM_KEEPALIVE_EXPIRY_SECONDS = float(os.getenv("LLM_KEEPALIVE_EXPIRY_SECONDS", "60"))
+CONTEXT_CONCURRENCY = 3
+EXTRACTION_CACHE_SIZE = int(os.getenv("EXTRACTION_CACHE_SIZE", "512"))
+# "per_post": one extraction call per post, then the answer call
+# "batched": one extraction call for all posts missing facts, then the answer call
+AGENT_GRAPH_MODE = os.getenv("AGENT_GRAPH_MODE", "per_post").lower()
+GRAPH_MODES = ("per_post", "batched")
+# Draft a no-context answer while the context stage runs (node_speculative_answer)
+SPECULATIVE_ANSWER = os.getenv("SPECULATIVE_ANSWER", "false").lower() in (
+    "1",
+    "true",
+)
+SPECULATIVE_CONTEXT_DEADLINE_SECONDS = float(
+    os.getenv("SPECULATIVE_CONTEXT_DEADLINE_SECONDS", "8")
+)
+# Longest wait for either the draft or the context before the request fails
+SPECULATIVE_TIMEOUT_SECONDS = float(os.getenv("SPECULATIVE_TIMEOUT_SECONDS", "30"))
+# Threads shared by concurrent sync speculative requests (two per request)
+SPECULATIVE_SYNC_WORKERS = int(os.getenv("SPECULATIVE_SYNC_WORKERS", "16"))
+
+
+class ExtractionCache:
+    """Thread-safe bounded LRU of post_id -> extracted facts.
+
+    Covers posts the background backfill has not processed yet, so a popular
+    post is sent to the LLM once instead of on every chat that retrieves it.
+    """
+
+    def __init__(self, maxsize: int = EXTRACTION_CACHE_SIZE) -> None:
+        self.maxsize = max(maxsize, 1)
+        self._entries: OrderedDict[str, str] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, post_id: str) -> str | None:
+        """Return the cached facts of a post and mark it as recently used."""
+        with self._lock:
+            extracted = self._entries.get(post_id)
+            if extracted is not None:
+                self._entries.move_to_end(post_id)
+            return extracted
+
+    def put(self, post_id: str, extracted: str) -> None:
+        """Store the facts of a post, evicting the least recently used entry."""
+        if not extracted:
+            return
+        with self._lock:
+            self._entries[post_id] = extracted
+            self._entries.move_to_end(post_id)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+
+EXTRACTION_CACHE = ExtractionCache()
 
 
 class State(TypedDict):
@@ -20,9 +90,11 @@ class State(TypedDict):
 
     Attributes:
         messages: List of messages with add_messages reducer.
+        draft: True when the answer was written without the Reddit context.
     """
 
     messages: Annotated[list, add_messages]
+    draft: NotRequired[bool]
 
 
 class FinBotAgent:
@@ -34,20 +106,42 @@ class FinBotAgent:
     def __init__(
         self,
         api_key: str = None,
-        model: str = "nvidia/nemotron-3-super-120b-a12b:free",
+        model: str = DEFAULT_MODEL,
         temperature: float = 0.0,
+        base_url: str = None,
+        graph_mode: str = AGENT_GRAPH_MODE,
+        speculative: bool = SPECULATIVE_ANSWER,
     ):
         load_dotenv()
+        if graph_mode not in GRAPH_MODES:
+            raise ValueError(f"Unknown AGENT_GRAPH_MODE={graph_mode}")
+        self.graph_mode = graph_mode
+        self.speculative = speculative
         self.api_key = api_key or os.getenv("OPEN_ROUTER_KEY")
+        self.base_url = base_url or os.getenv("LLM_BASE_URL", DEFAULT_BASE_URL)
         self.model = model
         self.temperature = temperature
 
+        # Keep-alive pools so consecutive calls reuse the TLS connection
+        limits = httpx.Limits(
+            max_connections=LLM_MAX_CONNECTIONS,
+            max_keepalive_connections=LLM_MAX_CONNECTIONS,
+            keepalive_expiry=LLM_KEEPALIVE_EXPIRY_SECONDS,
+        )
+        self.http_client = httpx.Client(limits=limits)
+        self.http_async_client = httpx.AsyncClient(limits=limits)
+        # Draft and context calls of the sync speculative node
+        self._speculative_executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=SPECULATIVE_SYNC_WORKERS, thread_name_prefix="speculative"
+        )
         self.graph_builder = StateGraph(State)
         self.llm = ChatOpenAI(
             model=model,
             api_key=self.api_key,
             temperature=temperature,
-            base_url="https://openrouter.ai/api/v1",
+            base_url=self.base_url,
+            http_client=self.http_client,
+            http_async_client=self.http_async_client,
         )
         self.graph = None
 
@@ -68,27 +162,38 @@ class FinBotAgent:
         ]
         return any(marker.lower() in error_text.lower() for marker in transient_markers)
 
+    def _retry_kwargs(self, max_attempts: int, base_delay_seconds: float) -> dict:
+        """Build the Tenacity settings shared by the sync and async LLM calls."""
+        return {
+            "stop": stop_after_attempt(max_attempts),
+            "wait": wait_exponential(
+                multiplier=base_delay_seconds,
+                min=base_delay_seconds,
+                max=8,
+            ),
+            "retry": retry_if_exception(self._is_transient_provider_error),
+            "reraise": True,
+        }
+
     def _invoke_llm_with_retry(
         self,
         messages: list[dict[str, str]],
         *,
         max_attempts: int = 3,
         base_delay_seconds: float = 1.0,
+        cancelled: threading.Event | None = None,
     ):
-        """Invoke the chat model with Tenacity retries for transient failures."""
-        retrying = Retrying(
-            stop=stop_after_attempt(max_attempts),
-            wait=wait_exponential(
-                multiplier=base_delay_seconds,
-                min=base_delay_seconds,
-                max=8,
-            ),
-            retry=retry_if_exception(self._is_transient_provider_error),
-            reraise=True,
-        )
+        """Invoke the chat model with Tenacity retries for transient failures.
+
+        Once cancelled is set no new attempt starts; an attempt already sent
+        cannot be aborted by the sync client.
+        """
+        retrying = Retrying(**self._retry_kwargs(max_attempts, base_delay_seconds))
 
         for attempt in retrying:
             with attempt:
+                if cancelled is not None and cancelled.is_set():
+                    raise concurrent.futures.CancelledError()
                 attempt_number = attempt.retry_state.attempt_number
                 if attempt_number > 1:
                     logger.warning(
@@ -98,8 +203,63 @@ class FinBotAgent:
                     )
                 return self.llm.invoke(messages)
 
-    def extract_finance_facts(self, content_str: str) -> str:
-        """Extract concise factual finance information from raw reddit content."""
+    async def _ainvoke_llm_with_retry(
+        self,
+        messages: list[dict[str, str]],
+        *,
+        max_attempts: int = 3,
+        base_delay_seconds: float = 1.0,
+    ):
+        """Async counterpart of _invoke_llm_with_retry, built on llm.ainvoke."""
+        retrying = AsyncRetrying(**self._retry_kwargs(max_attempts, base_delay_seconds))
+
+        async for attempt in retrying:
+            with attempt:
+                attempt_number = attempt.retry_state.attempt_number
+                if attempt_number > 1:
+                    logger.warning(
+                        "Retrying transient LLM error, attempt %s/%s",
+                        attempt_number,
+                        max_attempts,
+                    )
+                return await self.llm.ainvoke(messages)
+
+    async def _astream_llm_with_retry(
+        self,
+        messages: list[dict[str, str]],
+        *,
+        max_attempts: int = 3,
+        base_delay_seconds: float = 1.0,
+    ) -> AsyncIterator[str]:
+        """Stream the chat model output, retrying transient errors until the first token.
+
+        Once a token has been sent to the caller the stream cannot be replayed,
+        so errors after that point are raised as is.
+        """
+        retrying = AsyncRetrying(**self._retry_kwargs(max_attempts, base_delay_seconds))
+
+        async for attempt in retrying:
+            with attempt:
+                attempt_number = attempt.retry_state.attempt_number
+                if attempt_number > 1:
+                    logger.warning(
+                        "Retrying transient LLM error, attempt %s/%s",
+                        attempt_number,
+                        max_attempts,
+                    )
+                stream = self.llm.astream(messages)
+                first_chunk = await anext(stream, None)
+
+        if first_chunk is None:
+            return
+        if first_chunk.content:
+            yield str(first_chunk.content)
+        async for chunk in stream:
+            if chunk.content:
+                yield str(chunk.content)
+
+    def _build_extraction_prompt(self, content_str: str) -> str:
+        """Build the query-independent fact extraction prompt for one post."""
         prompt = f"""
         You are an advanced information extraction agent.
         Your task is to analyze the provided text and extract only factual information.
@@ -125,16 +285,82 @@ class FinBotAgent:
         - Do not introduce yourself
         ###
         """
+        return prompt
+
+    def _build_batched_extraction_prompt(self, posts: list[tuple[str, str]]) -> str:
+        """Build one fact extraction prompt covering several posts."""
+        sections = "\n".join(
+            f"[POST {post_id}]\n{content[:5000]}\n[END POST {post_id}]"
+            for post_id, content in posts
+        )
+        prompt = f"""
+        You are an advanced information extraction agent.
+        For each post below, extract only factual information.
+        Remove any questions, personal information, feelings, opinions, or perceptions.
+        Keep only concise information related to finance, investments, budgeting,
+        financial planning, and wealth management.
+
+        Here are the posts to analyze:
+        ###
+        {sections}
+        ###
+
+        Response format:
+        ###
+        A single JSON object mapping each post ID to its list of facts:
+        {{"<post id>": ["Fact 1", "Fact 2"]}}
+        ###
+
+        Rules:
+        ###
+        - Extract only factual information
+        - Use an empty list for a post without facts
+        - Return only the JSON object, without code fences
+        ###
+        """
+        return prompt
+
+    def _parse_batched_facts(
+        self, response: str, post_ids: list[str]
+    ) -> tuple[dict[str, str], str]:
+        """Split a batched extraction response into per-post facts.
+
+        Returns:
+            (facts by post ID, unattributed facts). When the response is not
+            the expected JSON, it is kept whole as unattributed facts.
+        """
+        start, end = response.find("{"), response.rfind("}")
+        try:
+            data = json.loads(response[start : end + 1])
+        except ValueError:
+            logger.warning("Batched extraction did not return JSON, using raw text")
+            return {}, response
+
+        facts = {}
+        for post_id in post_ids:
+            post_facts = data.get(post_id) if isinstance(data, dict) else None
+            if isinstance(post_facts, list):
+                facts[post_id] = "\n".join(f"- {fact}" for fact in post_facts if fact)
+        return facts, ""
+
+    def extract_finance_facts(self, content_str: str) -> str:
+        """Extract concise factual finance information from raw reddit content."""
+        prompt = self._build_extraction_prompt(content_str)
         response = self._invoke_llm_with_retry(
             [{"role": "user", "content": prompt}], max_attempts=3
         )
         return str(response.content).strip()
 
-    # Node function to process the chat
-    def node_process_final_answer(self, state: State) -> dict[str, list]:
-        """
-        Use the response from say_hello as context, but answer the initial user question.
-        """
+    async def aextract_finance_facts(self, content_str: str) -> str:
+        """Async version of extract_finance_facts."""
+        prompt = self._build_extraction_prompt(content_str)
+        response = await self._ainvoke_llm_with_retry(
+            [{"role": "user", "content": prompt}], max_attempts=3
+        )
+        return str(response.content).strip()
+
+    def _build_final_answer_prompt(self, state: State) -> str:
+        """Build the final-answer prompt from the user question and extracted context."""
         # The first message is the user question, the last is the context_response
         user_message = state["messages"][0].content
         context_response = state["messages"][-1].content
@@ -173,121 +399,391 @@ class FinBotAgent:
         # USER QUESTION
         {user_message}
         """
+        return prompt
 
+    # Node function to process the chat
+    def node_process_final_answer(self, state: State) -> dict[str, list]:
+        """
+        Use the response from say_hello as context, but answer the initial user question.
+        """
+        prompt = self._build_final_answer_prompt(state)
         response = self._invoke_llm_with_retry(
             [{"role": "user", "content": prompt}], max_attempts=3
         )
         return {"messages": [response]}
 
+    async def anode_process_final_answer(self, state: State) -> dict[str, list]:
+        """Async version of node_process_final_answer."""
+        prompt = self._build_final_answer_prompt(state)
+        response = await self._ainvoke_llm_with_retry(
+            [{"role": "user", "content": prompt}], max_attempts=3
+        )
+        return {"messages": [response]}
+
+    def _build_draft_prompt(self, state: State) -> str:
+        """Build the final-answer prompt without any Reddit context."""
+        return self._build_final_answer_prompt(
+            {"messages": [state["messages"][0], AIMessage(content="")]}
+        )
+
+    def node_speculative_answer(self, state: State) -> dict:
+        """Run the context stage and a no-context draft answer side by side.
+
+        When the context is ready within SPECULATIVE_CONTEXT_DEADLINE_SECONDS
+        the draft is dropped and the grounded answer is generated. Past it,
+        whichever of the draft and the context lands first is used, the
+        context winning ties; a failed draft falls back to the context. If
+        neither lands within SPECULATIVE_TIMEOUT_SECONDS, TimeoutError is raised.
+
+        Both calls run on the agent's shared speculative executor. The sync
+        client cannot abort a request in flight: a losing draft already sent
+        still completes (and is billed), it is only kept from retrying. The
+        async node cancels it for real.
+        """
+        give_up_at = time.monotonic() + SPECULATIVE_TIMEOUT_SECONDS
+        draft_cancelled = threading.Event()
+        draft = self._speculative_executor.submit(
+            self._invoke_llm_with_retry,
+            [{"role": "user", "content": self._build_draft_prompt(state)}],
+            cancelled=draft_cancelled,
+        )
+        context = self._speculative_executor.submit(self._context, state)
+        try:
+            done, _ = concurrent.futures.wait(
+                [context], timeout=SPECULATIVE_CONTEXT_DEADLINE_SECONDS
+            )
+            pending = {context, draft} - done
+            while context not in done:
+                done, pending = concurrent.futures.wait(
+                    pending,
+                    timeout=max(give_up_at - time.monotonic(), 0),
+                    return_when=concurrent.futures.FIRST_COMPLETED,
+                )
+                if not done:
+                    raise TimeoutError(
+                        f"No answer within {SPECULATIVE_TIMEOUT_SECONDS:.1f} s"
+                    )
+                if draft in done and context not in done:
+                    if draft.exception() is None:
+                        logger.warning(
+                            "Context missed the %.1f s deadline, returning the draft",
+                            SPECULATIVE_CONTEXT_DEADLINE_SECONDS,
+                        )
+                        return {"messages": [draft.result()], "draft": True}
+                    logger.warning(
+                        "Draft failed, waiting for context: %s", draft.exception()
+                    )
+            context_state = context.result()
+        finally:
+            # Do not wait for the call that is no longer needed
+            draft_cancelled.set()
+            draft.cancel()
+            context.cancel()
+
+        state = {"messages": add_messages(state["messages"], context_state["messages"])}
+        answer = self.node_process_final_answer(state)
+        return {
+            "messages": context_state["messages"] + answer["messages"],
+            "draft": False,
+        }
+
+    async def anode_speculative_answer(self, state: State) -> dict:
+        """Async version of node_speculative_answer; the losing task is cancelled."""
+        loop = asyncio.get_running_loop()
+        give_up_at = loop.time() + SPECULATIVE_TIMEOUT_SECONDS
+        draft = asyncio.create_task(
+            self._ainvoke_llm_with_retry(
+                [{"role": "user", "content": self._build_draft_prompt(state)}]
+            )
+        )
+        context = asyncio.create_task(self._acontext(state))
+        try:
+            done, _ = await asyncio.wait(
+                {context}, timeout=SPECULATIVE_CONTEXT_DEADLINE_SECONDS
+            )
+            pending = {context, draft} - done
+            while context not in done:
+                done, pending = await asyncio.wait(
+                    pending,
+                    timeout=max(give_up_at - loop.time(), 0),
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if not done:
+                    raise asyncio.TimeoutError(
+                        f"No answer within {SPECULATIVE_TIMEOUT_SECONDS:.1f} s"
+                    )
+                if draft in done and context not in done:
+                    if draft.exception() is None:
+                        logger.warning(
+                            "Context missed the %.1f s deadline, returning the draft",
+                            SPECULATIVE_CONTEXT_DEADLINE_SECONDS,
+                        )
+                        return {"messages": [draft.result()], "draft": True}
+                    logger.warning(
+                        "Draft answer failed, waiting for context: %s",
+                        draft.exception(),
+                    )
+            context_state = context.result()
+        finally:
+            draft.cancel()
+            context.cancel()
+
+        state = {"messages": add_messages(state["messages"], context_state["messages"])}
+        answer = await self.anode_process_final_answer(state)
+        return {
+            "messages": context_state["messages"] + answer["messages"],
+            "draft": False,
+        }
+
+    def _post_context(self, post_id: str, content: str, extracted: str | None) -> str:
+        """Return the facts of one post: precomputed, cached, or extracted now.
+
+        LLM errors are logged and give an empty string so one post cannot fail
+        the whole chat.
+        """
+        if extracted:
+            return extracted
+        cached = EXTRACTION_CACHE.get(post_id)
+        if cached is not None:
+            return cached
+        try:
+            extracted = self.extract_finance_facts(content)
+        except Exception as error:  # noqa: BLE001
+            logger.warning("Skipping one context post due to LLM error: %s", error)
+            return ""
+        EXTRACTION_CACHE.put(post_id, extracted)
+        return extracted
+
+    async def _apost_context(
+        self, post_id: str, content: str, extracted: str | None
+    ) -> str:
+        """Async version of _post_context."""
+        if extracted:
+            return extracted
+        cached = EXTRACTION_CACHE.get(post_id)
+        if cached is not None:
+            return cached
+        try:
+            extracted = await self.aextract_finance_facts(content)
+        except Exception as error:  # noqa: BLE001
+            logger.warning("Skipping one context post due to LLM error: %s", error)
+            return ""
+        EXTRACTION_CACHE.put(post_id, extracted)
+        return extracted
+
+    def _split_known_facts(
+        self, top_k_posts: list[tuple[str, str, str | None]]
+    ) -> tuple[dict[str, str], list[tuple[str, str]]]:
+        """Separate posts with precomputed or cached facts from those to extract."""
+        known, missing = {}, []
+        for post_id, content, extracted in top_k_posts:
+            facts = extracted or EXTRACTION_CACHE.get(post_id)
+            if facts:
+                known[post_id] = facts
+            else:
+                missing.append((post_id, content))
+        return known, missing
+
+    def _merge_batched_facts(
+        self,
+        top_k_posts: list[tuple[str, str, str | None]],
+        known: dict[str, str],
+        response: str | None,
+    ) -> list[str]:
+        """Cache the facts of a batched extraction and list facts in post order."""
+        extra = ""
+        if response:
+            missing_ids = [post[0] for post in top_k_posts if post[0] not in known]
+            facts, extra = self._parse_batched_facts(response, missing_ids)
+            for post_id, post_facts in facts.items():
+                EXTRACTION_CACHE.put(post_id, post_facts)
+            known = {**known, **facts}
+        return [known.get(post_id, "") for post_id, _, _ in top_k_posts] + [extra]
+
+    def _clean_extraction(self, response: str) -> str:
+        """Drop format markers and trailing notes the LLM adds around the facts."""
+        response = response.split("Note:")[0]
+        return "\n".join(
+            line
+            for line in response.split("\n")
+            if line.strip() and line.strip() != "###"
+        )
+
+    def _combine_context_responses(
+        self, state: State, all_responses: list[str]
+    ) -> dict[str, list]:
+        """Merge per-post extractions into one assistant context message.
+
+        Facts are ranked, deduplicated and packed into the context token budget.
+        """
+        all_responses = [self._clean_extraction(response) for response in all_responses]
+        combined_response = context_assembler.get_context_assembler().assemble(
+            state["messages"][0].content, all_responses
+        )
+        messages = state.get("messages", []) + [
+            {"role": "assistant", "content": combined_response}
+        ]
+        return {"messages": messages}
+
     def node_context(self, state: State) -> dict[str, list]:
         """
-        Node that extracts context from reddit posts stored in vector DB.
+        Node that gathers the extracted facts of the closest reddit posts.
         """
-        top_k_posts = vector_db_adapter.get_top_k_reddit_posts(
-            user_input=state["messages"][0].content, k=5
+        start_time = time.perf_counter()
+        user_input = state["messages"][0].content
+        top_k_posts = vector_db_adapter.get_top_k_reddit_post_contexts(
+            user_input=user_input, k=5
+        )
+
+        logger.info(f"Retrieved {len(top_k_posts)} top Reddit posts for context.")
+
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=CONTEXT_CONCURRENCY
+        ) as executor:
+            all_responses = list(
+                executor.map(lambda post: self._post_context(*post), top_k_posts)
+            )
+
+        context = self._combine_context_responses(state, all_responses)
+        logger.info("Context stage took %.3f seconds", time.perf_counter() - start_time)
+        return context
+
+    async def anode_context(self, state: State) -> dict[str, list]:
+        """Async version of node_context, extracting missing posts concurrently."""
+        start_time = time.perf_counter()
+        user_input = state["messages"][0].content
+        top_k_posts = await asyncio.to_thread(
+            vector_db_adapter.get_top_k_reddit_post_contexts,
+            user_input=user_input,
+            k=5,
         )
 
         logger.info(f"Retrieved {len(top_k_posts)} top Reddit posts for context.")
 
-        # Process each post asynchronously
-        async def process_post(post):
-            prompt = f"""
-            You are an advanced information extraction agent. 
-            Your task is to analyze the provided text and extract only factual information. Remove any questions, personal information, feelings, opinions, or perceptions.
-            Extract only general information always true not specific to the user input.
-            Present the extracted facts in a concise and structured manner.
-            Keep only the most relevant information and remove any unnecessary details.
-            Keep only information related to finance, investments, budgeting, financial planning, and wealth management.
-            Keep only information related to the user input.
-            
-            Here is the the text to analyze:
-            ###
-            {post[:5000]}
-            ###
-            
-            Here is the user input:
-            ###
-            {state["messages"][0].content}
-            ###
-            
-            Response format example:
-            ###
-            - The stock market is influenced by various factors including economic indicators, interest rates, and geopolitical events.
-            - Diversification is a key strategy in investment to mitigate risk.
-            - Budgeting is essential for effective financial planning and achieving long-term financial goals.
-            - Wealth management involves strategic planning to grow and protect assets over time.
-            ###
-            
-            Ensure to strictly follow response format
-            
-            Rules to follow:
-            ###
-            - Extract only factual information
-            - Remove any questions, personal information, feelings, opinions, or perceptions
-            - Return just fact, do not introduce yourself or the task
-            ###
-            """
+        semaphore = asyncio.Semaphore(CONTEXT_CONCURRENCY)
+
+        async def process_post_with_limit(post):
+            async with semaphore:
+                return await self._apost_context(*post)
+
+        all_responses = await asyncio.gather(
+            *[process_post_with_limit(post) for post in top_k_posts]
+        )
+        # Assembly embeds the facts, keep it off the event loop
+        context = await asyncio.to_thread(
+            self._combine_context_responses, state, all_responses
+        )
+        logger.info("Context stage took %.3f seconds", time.perf_counter() - start_time)
+        return context
+
+    def node_batched_context(self, state: State) -> dict[str, list]:
+        """Context node extracting every post missing facts in one LLM call."""
+        start_time = time.perf_counter()
+        user_input = state["messages"][0].content
+        top_k_posts = vector_db_adapter.get_top_k_reddit_post_contexts(
+            user_input=user_input, k=5
+        )
+        known, missing = self._split_known_facts(top_k_posts)
+
+        response = None
+        if missing:
+            logger.info("Batched extraction of %d posts in one LLM call", len(missing))
+            prompt = self._build_batched_extraction_prompt(missing)
             try:
-                response = await asyncio.to_thread(
-                    self._invoke_llm_with_retry,
-                    [{"role": "user", "content": prompt}],
+                response = str(
+                    self._invoke_llm_with_retry(
+                        [{"role": "user", "content": prompt}], max_attempts=3
+                    ).content
                 )
-                return response.content
             except Exception as error:  # noqa: BLE001
-                logger.warning("Skipping one context post due to LLM error: %s", error)
-                return ""
+                logger.warning("Batched extraction skipped due to LLM error: %s", error)
+
+        all_responses = self._merge_batched_facts(top_k_posts, known, response)
+        context = self._combine_context_responses(state, all_responses)
+        logger.info("Context stage took %.3f seconds", time.perf_counter() - start_time)
+        return context
+
+    async def anode_batched_context(self, state: State) -> dict[str, list]:
+        """Async version of node_batched_context."""
+        start_time = time.perf_counter()
+        user_input = state["messages"][0].content
+        top_k_posts = await asyncio.to_thread(
+            vector_db_adapter.get_top_k_reddit_post_contexts,
+            user_input=user_input,
+            k=5,
+        )
+        known, missing = self._split_known_facts(top_k_posts)
 
-        async def process_all_posts():
-            semaphore = asyncio.Semaphore(3)
+        response = None
+        if missing:
+            logger.info("Batched extraction of %d posts in one LLM call", len(missing))
+            prompt = self._build_batched_extraction_prompt(missing)
+            try:
+                response = str(
+                    (
+                        await self._ainvoke_llm_with_retry(
+                            [{"role": "user", "content": prompt}], max_attempts=3
+                        )
+                    ).content
+                )
+            except Exception as error:  # noqa: BLE001
+                logger.warning("Batched extraction skipped due to LLM error: %s", error)
 
-            async def process_post_with_limit(post):
-                async with semaphore:
-                    return await process_post(post)
+        all_responses = self._merge_batched_facts(top_k_posts, known, response)
+        context = await asyncio.to_thread(
+            self._combine_context_responses, state, all_responses
+        )
+        logger.info("Context stage took %.3f seconds", time.perf_counter() - start_time)
+        return context
 
-            tasks = [process_post_with_limit(post) for post in top_k_posts]
-            return await asyncio.gather(*tasks)
+    def _context(self, state: State) -> dict[str, list]:
+        """Run the context node of the configured graph mode."""
+        if self.graph_mode == "batched":
+            return self.node_batched_context(state)
+        return self.node_context(state)
 
-        # Handle async processing in a sync context
-        try:
-            # Try to get the current event loop
-            loop = asyncio.get_event_loop()
-            if loop.is_running():
-                # If event loop is running, create a new thread
-                with concurrent.futures.ThreadPoolExecutor() as executor:
-                    future = executor.submit(asyncio.run, process_all_posts())
-                    all_responses = future.result()
-            else:
-                # If no event loop is running, use asyncio.run
-                all_responses = asyncio.run(process_all_posts())
-        except RuntimeError:
-            # No event loop exists, safe to use asyncio.run
-            all_responses = asyncio.run(process_all_posts())
-
-        # Combine all responses
-        all_responses = [
-            "\n".join(response.split("\n")[1:])
-            for response in all_responses
-            if response.strip()
-        ]
-        all_responses = [
-            "\n".join(response.split("Note:")[0:1])
-            for response in all_responses
-            if response.strip()
-        ]
-        combined_response = "\n".join(all_responses)
-        messages = state.get("messages", []) + [
-            {"role": "assistant", "content": combined_response}
-        ]
-        return {"messages": messages}
+    async def _acontext(self, state: State) -> dict[str, list]:
+        """Run the async context node of the configured graph mode."""
+        if self.graph_mode == "batched":
+            return await self.anode_batched_context(state)
+        return await self.anode_context(state)
 
     def _build_graph(self) -> None:
         """
         Build the state graph for the agent.
+
+        In "batched" mode the context node extracts every post in one LLM
+        call, so a chat costs at most two calls instead of up to six. With
+        speculative answers a single node runs the context stage next to a
+        no-context draft.
         """
-        # Nodes of the graph
-        self.graph_builder.add_node("node_context", self.node_context)
+        # Nodes of the graph, each with a sync and an async implementation so
+        # the same compiled graph serves both invoke and ainvoke
+        if self.speculative:
+            self.graph_builder.add_node(
+                "node_speculative_answer",
+                RunnableLambda(
+                    self.node_speculative_answer,
+                    afunc=self.anode_speculative_answer,
+                ),
+            )
+            self.graph_builder.add_edge(START, "node_speculative_answer")
+            self.graph = self.graph_builder.compile()
+            return
+
+        if self.graph_mode == "batched":
+            context_node = RunnableLambda(
+                self.node_batched_context, afunc=self.anode_batched_context
+            )
+        else:
+            context_node = RunnableLambda(self.node_context, afunc=self.anode_context)
+        self.graph_builder.add_node("node_context", context_node)
         self.graph_builder.add_node(
-            "node_process_final_answer", self.node_process_final_answer
+            "node_process_final_answer",
+            RunnableLambda(
+                self.node_process_final_answer,
+                afunc=self.anode_process_final_answer,
+            ),
         )
         # Path of the graph
         self.graph_builder.add_edge(START, "node_context")
@@ -308,6 +804,51 @@ class FinBotAgent:
         final_state = self.graph.invoke(initial_state)
         return final_state["messages"][-1].content
 
+    async def arun(self, input_text: str):
+        """Run the agent without blocking the event loop.
+
+        Args:
+            input_text: The user's input question or message.
+
+        Returns:
+            The agent's response as a string.
+        """
+        response, _ = await self.arun_with_draft_flag(input_text)
+        return response
+
+    async def arun_with_draft_flag(self, input_text: str) -> tuple[str, bool]:
+        """Run the agent and tell whether the answer is a no-context draft.
+
+        Args:
+            input_text: The user's input question or message.
+
+        Returns:
+            The agent's response and True when it was written without the
+            Reddit context because the context missed its deadline.
+        """
+        initial_state = {"messages": [{"role": "user", "content": f"{input_text}"}]}
+        final_state = await self.graph.ainvoke(initial_state)
+        return final_state["messages"][-1].content, final_state.get("draft", False)
+
+    async def astream(self, input_text: str) -> AsyncIterator[str]:
+        """Run the context stage, then stream the final answer token by token.
+
+        Args:
+            input_text: The user's input question or message.
+
+        Yields:
+            Pieces of the final answer as they arrive from the LLM.
+        """
+        state = {"messages": add_messages([], [{"role": "user", "content": input_text}])}
+        context = await self._acontext(state)
+        state = {"messages": add_messages(state["messages"], context["messages"])}
+
+        prompt = self._build_final_answer_prompt(state)
+        async for token in self._astream_llm_with_retry(
+            [{"role": "user", "content": prompt}], max_attempts=3
+        ):
+            yield token
+
     def estimate_tokens(self, text: str) -> int:
         """Estimate the number of tokens in the given text.
 
@@ -317,4 +858,43 @@ class FinBotAgent:
         Returns:
             Estimated token count.
         """
-        return int(len(text.split()) * 1.2)
+        return context_assembler.count_tokens(text)
+
+    async def aclose(self) -> None:
+        """Release the HTTP connections held by the LLM client."""
+        self.http_client.close()
+        await self.http_async_client.aclose()
+        self._speculative_executor.shutdown(wait=False, cancel_futures=True)
+
+
+_AGENT_POOL: dict[tuple[str, float], FinBotAgent] = {}
+_AGENT_POOL_LOCK = threading.Lock()
+
+
+def get_agent(model: str = DEFAULT_MODEL, temperature: float = 0.0) -> FinBotAgent:
+    """Get the process-wide agent for (model, temperature), building it once.
+
+    The compiled graph and the LLM client are stateless between runs, so a
+    single instance is shared by every request using the same settings.
+    """
+    key = (model, float(temperature))
+    agent = _AGENT_POOL.get(key)
+    if agent is not None:
+        return agent
+
+    with _AGENT_POOL_LOCK:
+        agent = _AGENT_POOL.get(key)
+        if agent is None:
+            logger.info("Building shared agent model=%s temperature=%s", *key)
+            agent = FinBotAgent(model=model, temperature=temperature)
+            _AGENT_POOL[key] = agent
+    return agent
+
+
+async def close_agent_pool() -> None:
+    """Close every pooled agent and empty the pool."""
+    with _AGENT_POOL_LOCK:
+        agents = list(_AGENT_POOL.values())
+        _AGENT_POOL.clear()
+    for agent in agents:
+        await agent.aclose()
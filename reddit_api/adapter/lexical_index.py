@@ -0,0 +1,276 @@
+"""In-process BM25 inverted index over post chunks, persisted to disk.
+
+Postings are kept per term in compact typed arrays (chunk position, term
+frequency) and scored with numpy. Each save appends a binary segment holding
+only the chunks added since the previous save; segments are merged into one
+once there are more than BM25_MAX_SEGMENTS.
+"""
+
+import bisect
+import glob
+import math
+import os
+import re
+import threading
+from array import array
+from collections import Counter
+
+import numpy as np
+
+from logger_config import logger
+
+BM25_K1 = float(os.getenv("BM25_K1", "1.2"))
+BM25_B = float(os.getenv("BM25_B", "0.75"))
+# Query terms found in more than this share of chunks are skipped: their IDF
+# is close to zero and their postings are the longest to walk
+BM25_MAX_DF_RATIO = float(os.getenv("BM25_MAX_DF_RATIO", "0.25"))
+# Below this document frequency a term is never skipped, for small corpora
+BM25_MIN_PRUNED_DF = 100
+BM25_MAX_SEGMENTS = int(os.getenv("BM25_MAX_SEGMENTS", "8"))
+# Tickers and account types (XEQT, FHSA, RRSP) must survive as single terms
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+# English and French function words (r/QuebecFinance), dropped when indexing
+# and querying
+STOPWORDS = frozenset(
+    """
+    a about above after again against all am an and any are as at be because
+    been before being below between both but by can could did do does doing
+    down during each few for from further had has have having he her here hers
+    herself him himself his how i if in into is it its itself just me more
+    most my myself no nor not now of off on once only or other our ours
+    ourselves out over own same she should so some such than that the their
+    theirs them themselves then there these they this those through to too
+    under until up very was we were what when where which while who whom why
+    will with would you your yours yourself yourselves s t d ll m re ve
+    au aux avec ce ces dans de des du elle en est et il ils je la le les leur
+    lui ma mais me mes moi mon ne nos notre nous on ou par pas pour qu que qui
+    sa se ses son sur ta te tes toi ton tu un une vos votre vous
+    """.split()
+)
+SEGMENT_GLOB = "segment-*.npz"
+TF_MAX = 65535
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercase a text and split it into alphanumeric terms, minus stopwords."""
+    return [
+        term for term in TOKEN_PATTERN.findall(text.lower()) if term not in STOPWORDS
+    ]
+
+
+def _join(strings: list[str]) -> np.ndarray:
+    """Pack newline-free strings into a byte array for a segment file."""
+    return np.frombuffer("\n".join(strings).encode("utf-8"), dtype=np.uint8)
+
+
+def _split(data: np.ndarray) -> list[str]:
+    """Unpack strings packed by _join."""
+    text = data.tobytes().decode("utf-8")
+    return text.split("\n") if text else []
+
+
+class BM25Index:
+    """Okapi BM25 over chunk texts, updated incrementally as chunks are indexed.
+
+    Chunks are referenced by their position; postings map each term to an
+    array of positions, in increasing order, and a parallel array of term
+    frequencies. Texts themselves are not kept, the vector store returns them.
+
+    Attributes:
+        index_dir: Folder holding the segment files.
+    """
+
+    def __init__(self, index_dir: str) -> None:
+        self.index_dir = index_dir
+        self._lock = threading.Lock()
+        self._reset()
+        self._load()
+
+    def _reset(self) -> None:
+        """Empty the in-memory index."""
+        self._doc_ids: list[str] = []
+        self._doc_lengths = array("I")
+        self._known_ids: set[str] = set()
+        self._postings: dict[str, tuple[array, array]] = {}
+        self._norms: np.ndarray | None = None
+        # Chunks already in segment files, and terms with postings past them
+        self._saved_count = 0
+        self._dirty_terms: set[str] = set()
+        self._cleared = False
+
+    def _segment_paths(self) -> list[str]:
+        return sorted(glob.glob(os.path.join(self.index_dir, SEGMENT_GLOB)))
+
+    def _load(self) -> None:
+        """Read the saved segments when there are any."""
+        paths = self._segment_paths()
+        if not paths:
+            logger.info("No BM25 index found in %s, starting empty", self.index_dir)
+            return
+
+        for path in paths:
+            with np.load(path) as segment:
+                start = int(segment["start"])
+                if start == 0:
+                    # A merged segment supersedes the ones before it
+                    self._reset()
+                elif start != len(self._doc_ids):
+                    logger.warning(
+                        "BM25 segment %s starts at %d, expected %d; "
+                        "discarding the index so the next sync rebuilds it",
+                        path,
+                        start,
+                        len(self._doc_ids),
+                    )
+                    self._reset()
+                    self._cleared = True
+                    return
+                self._append_segment(segment)
+        self._saved_count = len(self._doc_ids)
+        logger.info(
+            "Loaded BM25 index with %d chunks from %d segments",
+            len(self._doc_ids),
+            len(paths),
+        )
+
+    def _append_segment(self, segment) -> None:
+        """Add the chunks and postings of one segment file."""
+        doc_ids = _split(segment["doc_ids"])
+        self._doc_ids.extend(doc_ids)
+        self._known_ids.update(doc_ids)
+        self._doc_lengths.frombytes(segment["doc_lengths"].astype(np.uint32).tobytes())
+        offsets = segment["offsets"]
+        positions = segment["positions"].astype(np.uint32)
+        tfs = segment["tfs"].astype(np.uint16)
+        for i, term in enumerate(_split(segment["terms"])):
+            term_positions, term_tfs = self._postings.setdefault(
+                term, (array("I"), array("H"))
+            )
+            term_positions.frombytes(positions[offsets[i] : offsets[i + 1]].tobytes())
+            term_tfs.frombytes(tfs[offsets[i] : offsets[i + 1]].tobytes())
+
+    def __len__(self) -> int:
+        return len(self._doc_ids)
+
+    def add(self, ids: list[str], documents: list[str]) -> None:
+        """Index documents whose IDs are not indexed yet."""
+        with self._lock:
+            for doc_id, document in zip(ids, documents):
+                if doc_id in self._known_ids:
+                    continue
+                terms = tokenize(document)
+                position = len(self._doc_ids)
+                self._doc_ids.append(doc_id)
+                self._doc_lengths.append(len(terms))
+                self._known_ids.add(doc_id)
+                for term, tf in Counter(terms).items():
+                    term_positions, term_tfs = self._postings.setdefault(
+                        term, (array("I"), array("H"))
+                    )
+                    term_positions.append(position)
+                    term_tfs.append(min(tf, TF_MAX))
+                    self._dirty_terms.add(term)
+                self._norms = None
+
+    def clear(self) -> None:
+        """Drop every document; save removes the segment files."""
+        with self._lock:
+            self._reset()
+            self._cleared = True
+
+    def _write_segment(self, start: int, terms) -> None:
+        """Write the chunks from position start and their postings of terms."""
+        segment_terms, offsets, positions, tfs = [], [0], [], []
+        for term in sorted(terms):
+            term_positions, term_tfs = self._postings[term]
+            first = bisect.bisect_left(term_positions, start)
+            if first == len(term_positions):
+                continue
+            segment_terms.append(term)
+            positions.append(np.array(term_positions[first:], dtype=np.uint32))
+            tfs.append(np.array(term_tfs[first:], dtype=np.uint16))
+            offsets.append(offsets[-1] + len(term_positions) - first)
+
+        paths = self._segment_paths()
+        number = int(os.path.basename(paths[-1])[8:-4]) + 1 if paths else 1
+        path = os.path.join(self.index_dir, f"segment-{number:06d}.npz")
+        with open(path + ".tmp", mode="wb") as file:
+            np.savez(
+                file,
+                start=np.int64(start),
+                doc_ids=_join(self._doc_ids[start:]),
+                doc_lengths=np.array(self._doc_lengths[start:], dtype=np.uint32),
+                terms=_join(segment_terms),
+                offsets=np.array(offsets, dtype=np.int64),
+                positions=(
+                    np.concatenate(positions) if positions else np.zeros(0, np.uint32)
+                ),
+                tfs=np.concatenate(tfs) if tfs else np.zeros(0, np.uint16),
+            )
+        os.replace(path + ".tmp", path)
+
+    def save(self) -> None:
+        """Persist the chunks added since the last save as a new segment."""
+        with self._lock:
+            if not self._cleared and self._saved_count == len(self._doc_ids):
+                return
+            os.makedirs(self.index_dir, exist_ok=True)
+            old_paths = self._segment_paths()
+            if self._cleared or len(old_paths) >= BM25_MAX_SEGMENTS:
+                # Rewrite everything as one segment, then drop the old ones
+                if self._doc_ids:
+                    self._write_segment(0, self._postings)
+                for path in old_paths:
+                    os.remove(path)
+            else:
+                self._write_segment(self._saved_count, self._dirty_terms)
+            self._saved_count = len(self._doc_ids)
+            self._dirty_terms = set()
+            self._cleared = False
+        logger.info("Saved BM25 index with %d chunks", len(self._doc_ids))
+
+    def _document_norms(self) -> np.ndarray:
+        """Return the length normalization of every chunk, cached until add."""
+        if self._norms is None:
+            lengths = np.array(self._doc_lengths, dtype=np.float32)
+            average_length = float(lengths.mean()) or 1.0
+            self._norms = BM25_K1 * (1 - BM25_B + BM25_B * lengths / average_length)
+        return self._norms
+
+    def search(self, query: str, k: int) -> list[str]:
+        """Return the IDs of the k best BM25 matches, best first."""
+        terms = set(tokenize(query))
+        with self._lock:
+            doc_count = len(self._doc_ids)
+            if not terms or doc_count == 0 or k <= 0:
+                return []
+
+            norms = self._document_norms()
+            max_df = max(int(doc_count * BM25_MAX_DF_RATIO), BM25_MIN_PRUNED_DF)
+            known = sorted(
+                (len(self._postings[term][0]), term)
+                for term in terms
+                if term in self._postings
+            )
+            # The rarest term is always scored so a query is never emptied
+            kept = [
+                term for i, (df, term) in enumerate(known) if i == 0 or df <= max_df
+            ]
+            scores = np.zeros(doc_count, dtype=np.float32)
+            for term in kept:
+                postings = self._postings[term]
+                # Copies, so no buffer of the growable arrays outlives the lock
+                positions = np.array(postings[0], dtype=np.int64)
+                tfs = np.array(postings[1], dtype=np.float32)
+                matches = len(positions)
+                idf = math.log(1 + (doc_count - matches + 0.5) / (matches + 0.5))
+                scores[positions] += (
+                    idf * tfs * (BM25_K1 + 1) / (tfs + norms[positions])
+                )
+
+            matched = np.flatnonzero(scores)
+            if len(matched) > k:
+                matched = matched[np.argpartition(-scores[matched], k - 1)[:k]]
+            # Best score first, earlier chunk first on ties
+            order = np.lexsort((matched, -scores[matched]))
+            return [self._doc_ids[position] for position in matched[order]]
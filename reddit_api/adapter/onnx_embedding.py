@@ -0,0 +1,143 @@
+"""ONNX Runtime embedding backend for the sentence-transformers MiniLM model."""
+
+import os
+
+import numpy as np
+import onnxruntime as ort
+from tokenizers import Tokenizer
+
+from logger_config import logger
+
+ONNX_MODEL_FILE = "model.onnx"
+ONNX_INT8_MODEL_FILE = "model.int8.onnx"
+TOKENIZER_FILE = "tokenizer.json"
+MAX_SEQ_LENGTH = 128
+
+
+def export_onnx_model(model_name: str, output_dir: str, quantize: bool) -> str:
+    """Export a SentenceTransformer transformer module to ONNX.
+
+    The PyTorch model is only loaded here, so later starts read the exported
+    files directly. With quantize, weights are additionally stored as int8
+    through onnxruntime dynamic quantization.
+
+    Args:
+        model_name: sentence-transformers model name.
+        output_dir: Folder receiving the ONNX model and tokenizer.
+        quantize: Whether to also write the int8 model.
+
+    Returns:
+        Path of the ONNX model to load.
+    """
+    # pylint: disable=import-outside-toplevel
+    import torch
+    from sentence_transformers import SentenceTransformer
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    os.makedirs(output_dir, exist_ok=True)
+    fp32_path = os.path.join(output_dir, ONNX_MODEL_FILE)
+    if not os.path.exists(fp32_path):
+        logger.info("Exporting embedding model=%s to ONNX", model_name)
+        st_model = SentenceTransformer(model_name, device="cpu")
+        st_model.tokenizer.save_pretrained(output_dir)
+        transformer = st_model[0].auto_model.eval()
+        dummy = st_model.tokenizer(
+            ["export sample"], return_tensors="pt", padding=True
+        )
+        dynamic_axes = {"batch": 0, "sequence": 1}
+        with torch.no_grad():
+            torch.onnx.export(
+                transformer,
+                (
+                    dummy["input_ids"],
+                    dummy["attention_mask"],
+                    dummy["token_type_ids"],
+                ),
+                fp32_path,
+                input_names=["input_ids", "attention_mask", "token_type_ids"],
+                output_names=["last_hidden_state"],
+                dynamic_axes={
+                    "input_ids": dynamic_axes,
+                    "attention_mask": dynamic_axes,
+                    "token_type_ids": dynamic_axes,
+                    "last_hidden_state": dynamic_axes,
+                },
+                opset_version=14,
+            )
+
+    if not quantize:
+        return fp32_path
+
+    int8_path = os.path.join(output_dir, ONNX_INT8_MODEL_FILE)
+    if not os.path.exists(int8_path):
+        logger.info("Quantizing ONNX embedding model to int8")
+        quantize_dynamic(fp32_path, int8_path, weight_type=QuantType.QInt8)
+    return int8_path
+
+
+class OnnxEmbeddingModel:
+    """Drop-in replacement for SentenceTransformer.encode backed by ONNX Runtime.
+
+    Reproduces the model's mean pooling so vectors stay compatible with the
+    ones already stored in Chroma.
+    """
+
+    def __init__(self, model_name: str, model_dir: str, quantize: bool = False):
+        model_path = os.path.join(
+            model_dir, ONNX_INT8_MODEL_FILE if quantize else ONNX_MODEL_FILE
+        )
+        if not os.path.exists(model_path) or not os.path.exists(
+            os.path.join(model_dir, TOKENIZER_FILE)
+        ):
+            model_path = export_onnx_model(model_name, model_dir, quantize)
+
+        self.tokenizer = Tokenizer.from_file(os.path.join(model_dir, TOKENIZER_FILE))
+        self.tokenizer.enable_truncation(max_length=MAX_SEQ_LENGTH)
+        self.tokenizer.enable_padding()
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = ort.InferenceSession(
+            model_path, options, providers=["CPUExecutionProvider"]
+        )
+        self.input_names = {node.name for node in self.session.get_inputs()}
+        logger.info("Loaded ONNX embedding model from %s", model_path)
+
+    def _encode_batch(self, texts: list[str]) -> np.ndarray:
+        """Encode one batch and mean-pool the token embeddings."""
+        encodings = self.tokenizer.encode_batch(texts)
+        input_ids = np.array([encoding.ids for encoding in encodings], dtype="int64")
+        attention_mask = np.array(
+            [encoding.attention_mask for encoding in encodings], dtype="int64"
+        )
+        feeds = {"input_ids": input_ids, "attention_mask": attention_mask}
+        if "token_type_ids" in self.input_names:
+            feeds["token_type_ids"] = np.array(
+                [encoding.type_ids for encoding in encodings], dtype="int64"
+            )
+
+        token_embeddings = self.session.run(None, feeds)[0]
+        mask = attention_mask[..., None].astype("float32")
+        summed = (token_embeddings * mask).sum(axis=1)
+        return summed / np.clip(mask.sum(axis=1), 1e-9, None)
+
+    def encode(
+        self,
+        sentences: str | list[str],
+        batch_size: int = 32,
+        convert_to_numpy: bool = True,  # pylint: disable=unused-argument
+        show_progress_bar: bool = False,  # pylint: disable=unused-argument
+    ) -> np.ndarray:
+        """Embed one text or a list of texts, like SentenceTransformer.encode."""
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+        if not texts:
+            return np.zeros((0, 0), dtype="float32")
+
+        vectors = np.concatenate(
+            [
+                self._encode_batch(texts[i : i + batch_size])
+                for i in range(0, len(texts), batch_size)
+            ]
+        ).astype("float32")
+        return vectors[0] if single else vectors
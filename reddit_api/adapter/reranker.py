@@ -0,0 +1,90 @@
+"""Cross-encoder reranking of retrieved posts under a latency budget."""
+
+import os
+import threading
+import time
+
+import numpy as np
+
+from logger_config import logger
+
+# Small batches so the deadline is checked often
+RERANK_BATCH_SIZE = int(os.getenv("RERANK_BATCH_SIZE", "8"))
+RERANK_MAX_LENGTH = int(os.getenv("RERANK_MAX_LENGTH", "256"))
+
+
+class CrossEncoderReranker:
+    """Score (query, post) pairs with a small cross-encoder on CPU.
+
+    Pairs are scored batch by batch. Each batch is sized from the measured
+    cost of one pair so it ends before the deadline; scoring stops when not
+    even one more pair fits, and the caller keeps the retrieval order for the
+    posts left unscored.
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        batch_size: int = RERANK_BATCH_SIZE,
+        max_length: int = RERANK_MAX_LENGTH,
+    ) -> None:
+        # pylint: disable=import-outside-toplevel
+        import torch
+        from sentence_transformers import CrossEncoder
+
+        logger.info("Loading rerank model=%s", model_name)
+        self.model = CrossEncoder(model_name, max_length=max_length, device="cpu")
+        self.batch_size = max(batch_size, 1)
+        # Scores in [0, 1] whatever activation the model config declares
+        self._activation = torch.nn.Sigmoid()
+        self._lock = threading.Lock()
+        self._seconds_per_pair: float | None = None
+        # Warm up, which also gives the first per-pair cost estimate
+        self.score("warm up", ["warm up"] * self.batch_size)
+
+    def _predict(self, query: str, documents: list[str]) -> np.ndarray:
+        """Score one batch and update the per-pair cost estimate."""
+        start = time.perf_counter()
+        scores = self.model.predict(
+            [(query, document) for document in documents],
+            batch_size=len(documents),
+            activation_fn=self._activation,
+            convert_to_numpy=True,
+            show_progress_bar=False,
+        )
+        per_pair = (time.perf_counter() - start) / len(documents)
+        with self._lock:
+            self._seconds_per_pair = (
+                per_pair
+                if self._seconds_per_pair is None
+                else 0.8 * self._seconds_per_pair + 0.2 * per_pair
+            )
+        return scores
+
+    def score(
+        self, query: str, documents: list[str], deadline: float | None = None
+    ) -> np.ndarray:
+        """Return relevance scores of the first documents scored before the deadline.
+
+        Args:
+            query: User question.
+            documents: Texts to score against the query, best retrieved first.
+            deadline: time.perf_counter() value scoring must end by.
+
+        Returns:
+            One score per document for a prefix of documents, all of them when
+            there is no deadline.
+        """
+        scores = []
+        start = 0
+        while start < len(documents):
+            size = self.batch_size
+            if deadline is not None and self._seconds_per_pair:
+                remaining = deadline - time.perf_counter()
+                size = min(size, int(remaining / self._seconds_per_pair))
+                if size < 1:
+                    break
+            batch = documents[start : start + size]
+            scores.append(self._predict(query, batch))
+            start += len(batch)
+        return np.concatenate(scores) if scores else np.zeros(0, dtype="float32")
@@ -1,9 +1,15 @@
 """Vector database adapter for similarity search on Reddit posts."""
 
+import argparse
+import json
 import os
 import sys
+import threading
+import time
+from collections.abc import Iterator
+from datetime import datetime
 from functools import lru_cache
-from typing import Any
+from typing import TYPE_CHECKING, Any
 import numpy as np
 
 try:
@@ -13,83 +19,572 @@ except ImportError:
     pass
 
 import chromadb
-from sentence_transformers import SentenceTransformer
 from dao import DAO
 from logger_config import logger
+from adapter.batch_embedder import MicroBatchEmbedder
+from adapter.embedding_cache import EmbeddingCache, encode_with_cache
+from adapter.lexical_index import BM25Index
+from adapter.reranker import CrossEncoderReranker
+from adapter import chunking
+
+if TYPE_CHECKING:
+    from sentence_transformers import SentenceTransformer
 
 MODEL_NAME_EMBEDDING = "paraphrase-MiniLM-L3-v2"
-CHROMA_COLLECTION_NAME = "reddit_posts"
+# Chunked index: one entry per post chunk, with a post_id back-reference
+CHROMA_COLLECTION_NAME = os.getenv("CHROMA_COLLECTION_NAME", "reddit_post_chunks")
 CHROMA_HOST = os.getenv("CHROMA_HOST", "localhost")
 CHROMA_PORT = int(os.getenv("CHROMA_PORT", "8000"))
 SYNC_BATCH_SIZE = int(os.getenv("VECTOR_SYNC_BATCH_SIZE", "2048"))
-
-
-def embed_text(text: str, model: SentenceTransformer) -> np.ndarray:
+WATERMARK_METADATA_KEY = "sync_watermark"
+# Chunks fetched per requested post, so k distinct posts survive grouping
+CHUNK_SEARCH_FACTOR = int(os.getenv("CHUNK_SEARCH_FACTOR", "4"))
+# "torch" (SentenceTransformer), "onnx" or "onnx-int8" (ONNX Runtime)
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "torch").lower()
+# "chroma" (remote HTTP server) or "faiss" (in-process index persisted on disk)
+VECTOR_BACKEND = os.getenv("VECTOR_BACKEND", "chroma").lower()
+FAISS_INDEX_TYPE = os.getenv("FAISS_INDEX_TYPE", "flat")
+FAISS_INDEX_DIR = os.getenv(
+    "FAISS_INDEX_DIR", os.path.join("static", "faiss", CHROMA_COLLECTION_NAME)
+)
+EMBEDDING_ONNX_DIR = os.getenv(
+    "EMBEDDING_ONNX_DIR", os.path.join("static", "onnx", MODEL_NAME_EMBEDDING)
+)
+LEXICAL_INDEX_DIR = os.getenv(
+    "LEXICAL_INDEX_DIR", os.path.join("static", "bm25", CHROMA_COLLECTION_NAME)
+)
+# Rank constant of reciprocal rank fusion between dense and BM25 results
+RRF_K = int(os.getenv("RRF_K", "60"))
+# Set RERANK_MODEL to an empty string to send dense/BM25 hits to the LLM as is
+RERANK_MODEL = os.getenv("RERANK_MODEL", "cross-encoder/ms-marco-MiniLM-L-6-v2")
+RERANK_CANDIDATES = int(os.getenv("RERANK_CANDIDATES", "20"))
+RERANK_MIN_SCORE = float(os.getenv("RERANK_MIN_SCORE", "0.05"))
+RERANK_BUDGET_MS = float(os.getenv("RERANK_BUDGET_MS", "150"))
+# Set to an empty string to disable the on-disk embedding cache
+EMBEDDING_CACHE_DIR = os.getenv(
+    "EMBEDDING_CACHE_DIR", os.path.join("static", "embedding_cache")
+)
+
+
+def embed_text(text: str, model: "SentenceTransformer") -> np.ndarray:
     """
     Convert text into an embedding vector using SentenceTransformers.
     """
     return model.encode(text, convert_to_numpy=True, show_progress_bar=False)
 
 
-@lru_cache(maxsize=1)
-def get_embedding_model() -> SentenceTransformer:
-    """Get a cached embedding model instance to avoid repeated loads."""
-    logger.info("Loading embedding model=%s", MODEL_NAME_EMBEDDING)
+def load_embedding_model(backend: str) -> "SentenceTransformer":
+    """Load the embedding model for a backend without caching it.
+
+    The ONNX backends expose the same encode signature and produce vectors
+    compatible with the ones already stored in Chroma.
+    """
+    # pylint: disable=import-outside-toplevel
+    logger.info("Loading embedding model=%s backend=%s", MODEL_NAME_EMBEDDING, backend)
+    if backend in ("onnx", "onnx-int8"):
+        from adapter.onnx_embedding import OnnxEmbeddingModel
+
+        return OnnxEmbeddingModel(
+            MODEL_NAME_EMBEDDING, EMBEDDING_ONNX_DIR, quantize=backend == "onnx-int8"
+        )
+    if backend != "torch":
+        raise ValueError(f"Unknown EMBEDDING_BACKEND={backend}")
+
+    from sentence_transformers import SentenceTransformer
+
     return SentenceTransformer(MODEL_NAME_EMBEDDING)
 
 
-def get_reddit_posts() -> list[tuple[str, str]]:
+# Serializes the first loads so concurrent callers never build a second model
+_MODEL_LOAD_LOCK = threading.RLock()
+_EMBEDDING_MODEL = None
+_QUERY_EMBEDDER: MicroBatchEmbedder | None = None
+
+
+def get_embedding_model() -> "SentenceTransformer":
+    """Get a cached embedding model instance to avoid repeated loads."""
+    global _EMBEDDING_MODEL  # pylint: disable=global-statement
+    if _EMBEDDING_MODEL is None:
+        with _MODEL_LOAD_LOCK:
+            if _EMBEDDING_MODEL is None:
+                _EMBEDDING_MODEL = load_embedding_model(EMBEDDING_BACKEND)
+    return _EMBEDDING_MODEL
+
+
+def get_query_embedder() -> MicroBatchEmbedder:
+    """Get the shared micro-batching embedder used for user queries.
+
+    The first call loads the model; call it off the event loop.
+    """
+    global _QUERY_EMBEDDER  # pylint: disable=global-statement
+    if _QUERY_EMBEDDER is None:
+        with _MODEL_LOAD_LOCK:
+            if _QUERY_EMBEDDER is None:
+                _QUERY_EMBEDDER = MicroBatchEmbedder(get_embedding_model())
+    return _QUERY_EMBEDDER
+
+
+@lru_cache(maxsize=1)
+def get_embedding_cache() -> EmbeddingCache | None:
+    """Get the on-disk cache of chunk embeddings, or None when disabled."""
+    if not EMBEDDING_CACHE_DIR:
+        return None
+    return EmbeddingCache(EMBEDDING_CACHE_DIR, MODEL_NAME_EMBEDDING)
+
+
+@lru_cache(maxsize=1)
+def get_lexical_index() -> BM25Index:
+    """Get the BM25 index kept alongside the vector store."""
+    return BM25Index(LEXICAL_INDEX_DIR)
+
+
+@lru_cache(maxsize=1)
+def get_reranker() -> CrossEncoderReranker | None:
+    """Get the shared cross-encoder reranker, or None when disabled."""
+    if not RERANK_MODEL:
+        return None
+    return CrossEncoderReranker(RERANK_MODEL)
+
+
+@lru_cache(maxsize=1)
+def get_chunk_tokenizer():
+    """Get the untruncated tokenizer used to split posts into chunks."""
+    return chunking.build_chunk_tokenizer(get_embedding_model().tokenizer)
+
+
+def get_reddit_posts() -> Iterator[tuple[str, str]]:
     """
-    Retrieve Reddit posts from the DAO.
-    Returns a list of tuples (post_id, post_content).
+    Stream Reddit posts from the DAO.
+    Yields tuples (post_id, post_content).
     """
-    logger.info("Loading reddit posts from DAO for vector indexing")
-    reddit_posts = DAO.get_instance(force_refresh=True).get_reddit_posts() or []
-    return [
-        (post.id, post.content_str)
-        for post in reddit_posts
-        if post.id is not None and post.content_str is not None
-    ]
+    logger.info("Streaming reddit posts from DAO for vector indexing")
+    for post_id, content_str in DAO.get_instance().iter_reddit_posts(
+        columns=("id", "content_str")
+    ):
+        if post_id is not None and content_str is not None:
+            yield post_id, content_str
+
+
+class ChromaCollectionHandle:
+    """Long-lived, lazily connected and thread-safe handle on the Chroma collection.
+
+    The collection size is cached so a query costs one round trip; it is
+    refreshed after each sync and whenever the connection is re-established.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._collection = None
+        self._count: int | None = None
+        self._max_batch_size: int | None = None
+
+    def get(self) -> Any:
+        """Return the collection, connecting on first use."""
+        with self._lock:
+            if self._collection is None:
+                logger.info(
+                    "Connecting to Chroma collection=%s host=%s port=%s",
+                    CHROMA_COLLECTION_NAME,
+                    CHROMA_HOST,
+                    CHROMA_PORT,
+                )
+                client = chromadb.HttpClient(host=CHROMA_HOST, port=CHROMA_PORT)
+                self._collection = client.get_or_create_collection(
+                    name=CHROMA_COLLECTION_NAME
+                )
+                self._max_batch_size = client.get_max_batch_size()
+                self._count = None
+            return self._collection
+
+    def reset(self) -> None:
+        """Drop the connection so the next call reconnects."""
+        with self._lock:
+            self._collection = None
+            self._count = None
+
+    def run(self, operation):
+        """Run operation(collection), reconnecting and retrying once on failure."""
+        try:
+            return operation(self.get())
+        except Exception:  # noqa: BLE001
+            logger.warning("Chroma call failed, reconnecting and retrying once")
+            self.reset()
+            return operation(self.get())
+
+    def count(self) -> int:
+        """Return the cached collection size, fetching it when unknown."""
+        with self._lock:
+            count = self._count
+        if count is None:
+            count = self.run(lambda collection: collection.count())
+            with self._lock:
+                self._count = count
+        return count
+
+    def refresh_count(self) -> int:
+        """Re-read the collection size, e.g. after a sync added documents."""
+        with self._lock:
+            self._count = None
+        return self.count()
+
+    def existing_ids(self, ids: list[str]) -> set[str]:
+        """Return the IDs already stored in the collection."""
+        return self.run(lambda collection: _get_existing_ids(collection, ids))
+
+    def upsert(
+        self,
+        ids: list[str],
+        documents: list[str],
+        embeddings: np.ndarray,
+        metadatas: list[dict] | None = None,
+    ) -> None:
+        """Insert or replace documents with their embeddings and metadata.
+
+        Writes are split into slices of the server's maximum batch size, which
+        a sync batch of chunked posts can exceed.
+        """
+        embeddings = np.asarray(embeddings, dtype="float32").tolist()
+        self.get()
+        step = max(self._max_batch_size or len(ids), 1)
+        for start in range(0, len(ids), step):
+            end = start + step
+            self.run(
+                lambda collection, start=start, end=end: collection.upsert(
+                    ids=ids[start:end],
+                    documents=documents[start:end],
+                    embeddings=embeddings[start:end],
+                    metadatas=metadatas[start:end] if metadatas else None,
+                )
+            )
+
+    def save(self) -> None:
+        """Nothing to do, the Chroma server persists every write."""
+
+    def clear(self) -> None:
+        """Delete the collection; the next call recreates it empty."""
+        with self._lock:
+            client = chromadb.HttpClient(host=CHROMA_HOST, port=CHROMA_PORT)
+            try:
+                client.delete_collection(name=CHROMA_COLLECTION_NAME)
+            except Exception:  # noqa: BLE001
+                logger.info("No Chroma collection=%s to delete", CHROMA_COLLECTION_NAME)
+            self._collection = None
+            self._count = None
+
+    def documents(self, ids: list[str], where: dict | None = None) -> dict[str, str]:
+        """Return the stored texts of entry IDs, optionally matching a filter."""
+        if not ids:
+            return {}
+        result = self.run(
+            lambda collection: collection.get(
+                ids=ids, where=where, include=["documents"]
+            )
+        )
+        return dict(zip(result.get("ids", []), result.get("documents", [])))
+
+    def get_watermark(self) -> tuple[datetime, str] | None:
+        """Return the sync watermark stored in the collection metadata."""
+        metadata = self.run(lambda collection: collection.metadata) or {}
+        return decode_watermark(metadata.get(WATERMARK_METADATA_KEY))
+
+    def set_watermark(self, watermark: tuple[datetime, str]) -> None:
+        """Store the sync watermark in the collection metadata."""
+
+        def modify(collection: Any) -> None:
+            # Distance settings cannot be re-sent once the collection exists
+            metadata = {
+                key: value
+                for key, value in (collection.metadata or {}).items()
+                if not key.startswith("hnsw:")
+            }
+            metadata[WATERMARK_METADATA_KEY] = encode_watermark(watermark)
+            collection.modify(metadata=metadata)
+
+        self.run(modify)
+
+    def search(
+        self, vector: np.ndarray, k: int, where: dict | None = None
+    ) -> list[tuple[str, str]]:
+        """Return (chunk_id, text) of the k nearest chunks, nearest first.
+
+        With where, only chunks whose metadata match the filter are searched.
+        """
+        result = self.run(
+            lambda collection: collection.query(
+                query_embeddings=[np.asarray(vector, dtype="float32").tolist()],
+                n_results=k,
+                where=where,
+            )
+        )
+        ids = result.get("ids", [[]])[0]
+        documents = result.get("documents", [[]])[0]
+        return list(zip(ids, documents))
+
+
+def encode_watermark(watermark: tuple[datetime, str]) -> str:
+    """Serialize a (date_insertion, post_id) sync watermark."""
+    date_insertion, post_id = watermark
+    return json.dumps(
+        {"date_insertion": date_insertion.isoformat(), "post_id": post_id}
+    )
+
+
+def decode_watermark(raw: str | None) -> tuple[datetime, str] | None:
+    """Parse a watermark written by encode_watermark."""
+    if not raw:
+        return None
+    data = json.loads(raw)
+    return datetime.fromisoformat(data["date_insertion"]), data["post_id"]
+
+
+CHROMA_HANDLE = ChromaCollectionHandle()
+
+
+@lru_cache(maxsize=1)
+def get_vector_store() -> Any:
+    """Get the vector store selected by VECTOR_BACKEND.
+
+    Both stores expose count, refresh_count, existing_ids, upsert, save,
+    clear, search, documents, get_watermark and set_watermark.
+    """
+    if VECTOR_BACKEND == "faiss":
+        # pylint: disable=import-outside-toplevel
+        from adapter.faiss_index import FaissPostIndex
+
+        return FaissPostIndex(
+            FAISS_INDEX_DIR, FAISS_INDEX_TYPE, load_documents=_load_chunk_documents
+        )
+    if VECTOR_BACKEND != "chroma":
+        raise ValueError(f"Unknown VECTOR_BACKEND={VECTOR_BACKEND}")
+    return CHROMA_HANDLE
 
 
 def get_collection() -> Any:
     """
-    Get or create the Chroma collection that stores Reddit post embeddings.
+    Get the shared Chroma collection that stores Reddit post embeddings.
+    """
+    return CHROMA_HANDLE.get()
+
+
+def _load_chunk_documents(chunk_ids: list[str]) -> dict[str, str]:
+    """Rebuild chunk texts from their posts, for FAISS indexes saved without them."""
+    post_ids = list(dict.fromkeys(chunking.post_id_from_chunk_id(c) for c in chunk_ids))
+    posts = DAO.get_instance().get_reddit_posts_by_ids(post_ids)
+    chunks = chunking.chunk_posts(posts, get_chunk_tokenizer())
+    wanted = set(chunk_ids)
+    return {chunk_id: text for chunk_id, _, text in chunks if chunk_id in wanted}
+
+
+def _group_chunks_by_post(
+    chunks: list[tuple[str, str]], k: int
+) -> list[tuple[str, str]]:
+    """Group ranked chunk hits into the k best posts.
+
+    Posts are ranked by their best chunk; the matched chunks of a post are
+    joined in their original order to form its content.
+    """
+    grouped: dict[str, list[tuple[int, str]]] = {}
+    for chunk_id, text in chunks:
+        post_id = chunking.post_id_from_chunk_id(chunk_id)
+        if post_id not in grouped and len(grouped) >= k:
+            continue
+        grouped.setdefault(post_id, []).append(
+            (chunking.chunk_index_from_chunk_id(chunk_id), text)
+        )
+    return [
+        (post_id, "\n...\n".join(text for _, text in sorted(post_chunks)))
+        for post_id, post_chunks in grouped.items()
+    ]
+
+
+def build_metadata_filter(
+    subreddit: str | None = None,
+    min_score: int | None = None,
+    max_age_days: float | None = None,
+) -> dict | None:
+    """Build a Chroma-style where filter on the post metadata of chunks.
+
+    Chunks indexed before the metadata was scraped carry none and never match
+    a filter; rebuild the index to include them.
     """
+    conditions = []
+    if subreddit:
+        conditions.append({"subreddit": {"$eq": subreddit}})
+    if min_score is not None:
+        conditions.append({"score": {"$gte": int(min_score)}})
+    if max_age_days is not None:
+        min_created = int(time.time() - max_age_days * 86400)
+        conditions.append({"created_utc": {"$gte": min_created}})
+
+    if not conditions:
+        return None
+    return conditions[0] if len(conditions) == 1 else {"$and": conditions}
+
+
+def _reciprocal_rank_fusion(rankings: list[list[str]]) -> list[str]:
+    """Merge ranked ID lists by the sum of 1 / (RRF_K + rank) over lists."""
+    scores: dict[str, float] = {}
+    for ranking in rankings:
+        for rank, entry_id in enumerate(ranking, start=1):
+            scores[entry_id] = scores.get(entry_id, 0.0) + 1 / (RRF_K + rank)
+    return sorted(scores, key=scores.get, reverse=True)
+
+
+def _hybrid_search(
+    store: Any,
+    user_input: str,
+    vector: np.ndarray,
+    n_results: int,
+    where: dict | None = None,
+) -> list[tuple[str, str]]:
+    """Fuse dense and BM25 chunk rankings; return (chunk_id, text), best first."""
+    dense = store.search(vector, n_results, where=where)
+    lexical_ids = get_lexical_index().search(user_input, n_results)
+    if not lexical_ids:
+        return dense
+
+    texts = dict(dense)
+    dense_ids = list(texts)
+    # BM25 has no metadata, the store applies the filter to its extra hits
+    texts.update(
+        store.documents([c for c in lexical_ids if c not in texts], where=where)
+    )
+    lexical_ids = [chunk_id for chunk_id in lexical_ids if chunk_id in texts]
+    fused = _reciprocal_rank_fusion([dense_ids, lexical_ids])[:n_results]
     logger.info(
-        "Connecting to Chroma collection=%s host=%s port=%s",
-        CHROMA_COLLECTION_NAME,
-        CHROMA_HOST,
-        CHROMA_PORT,
+        "Hybrid retrieval: %d dense, %d BM25, %d BM25-only chunks kept",
+        len(dense),
+        len(lexical_ids),
+        len(set(fused) - set(dense_ids)),
     )
-    client = chromadb.HttpClient(host=CHROMA_HOST, port=CHROMA_PORT)
-    return client.get_or_create_collection(name=CHROMA_COLLECTION_NAME)
+    return [(chunk_id, texts[chunk_id]) for chunk_id in fused if chunk_id in texts]
 
 
-def get_top_k_reddit_posts(user_input: str, k: int = 5) -> list[str]:
+def get_top_k_reddit_posts_with_ids(
+    user_input: str, k: int = 5, where: dict | None = None
+) -> list[tuple[str, str]]:
     """
-    Retrieve the top k Reddit posts from ChromaDB based on user input.
+    Retrieve the top k Reddit posts from the vector store as (post_id, content) tuples.
+
+    Dense chunk hits are fused with BM25 hits by reciprocal rank fusion, so
+    exact tickers and account types are not missed. The content of each post
+    is made of its chunks matching the query rather than the whole thread.
+    A where filter from build_metadata_filter is applied inside the index.
     """
     if k <= 0:
         return []
 
-    model = get_embedding_model()
-    collection = get_collection()
-    collection_count = collection.count()
+    store = get_vector_store()
+    collection_count = store.count()
     if collection_count == 0:
-        logger.info("Chroma collection is empty, no context posts available")
+        logger.info("Vector index is empty, no context posts available")
         return []
 
-    n_results = min(k, collection_count)
+    n_results = min(k * max(CHUNK_SEARCH_FACTOR, 1), collection_count)
 
-    user_input_vector = embed_text(user_input, model).astype("float32")
-    result = collection.query(
-        query_embeddings=[user_input_vector.tolist()],
-        n_results=n_results,
+    user_input_vector = get_query_embedder().embed(user_input).astype("float32")
+    chunks = _hybrid_search(store, user_input, user_input_vector, n_results, where)
+    posts = _group_chunks_by_post(chunks, k)
+    logger.info(
+        "Retrieved %d reddit posts from %d chunks in %s",
+        len(posts),
+        n_results,
+        VECTOR_BACKEND,
     )
-    logger.info("Retrieved top %d reddit posts from Chroma", n_results)
+    return posts
+
+
+def get_top_k_reddit_posts(
+    user_input: str,
+    k: int = 5,
+    subreddit: str | None = None,
+    min_score: int | None = None,
+    max_age_days: float | None = None,
+) -> list[str]:
+    """
+    Retrieve the top k Reddit posts from the vector store based on user input.
+
+    Optional filters restrict the search to a subreddit, a minimum Reddit
+    score and posts created within max_age_days.
+    """
+    where = build_metadata_filter(subreddit, min_score, max_age_days)
+    return [
+        document
+        for _, document in get_top_k_reddit_posts_with_ids(user_input, k, where)
+    ]
+
+
+def rerank_posts(
+    user_input: str, candidates: list[tuple[str, str]], k: int
+) -> list[tuple[str, str]]:
+    """Keep the k candidates best scored by the cross-encoder above RERANK_MIN_SCORE.
+
+    Candidates left unscored when RERANK_BUDGET_MS runs out follow the
+    reranked ones in retrieval order.
+    """
+    reranker = get_reranker()
+    if reranker is None or not candidates:
+        return candidates[:k]
+
+    start_time = time.perf_counter()
+    scores = reranker.score(
+        user_input,
+        [content for _, content in candidates],
+        deadline=start_time + RERANK_BUDGET_MS / 1000,
+    )
+    elapsed_ms = (time.perf_counter() - start_time) * 1000
+    if len(scores) == 0:
+        logger.warning(
+            "Rerank budget of %.0f ms too short to score any candidate, "
+            "keeping retrieval order",
+            RERANK_BUDGET_MS,
+        )
+        return candidates[:k]
+
+    scored = candidates[: len(scores)]
+    ranked = sorted(zip(scores, scored), key=lambda pair: pair[0], reverse=True)
+    kept = [post for score, post in ranked if score >= RERANK_MIN_SCORE]
+    kept = (kept + candidates[len(scores) :])[:k]
+    logger.info(
+        "Reranked %d/%d candidates in %.1f ms, kept %d above score %.2f",
+        len(scores),
+        len(candidates),
+        elapsed_ms,
+        len(kept),
+        RERANK_MIN_SCORE,
+    )
+    return kept
+
+
+def get_top_k_reddit_post_contexts(
+    user_input: str, k: int = 5, where: dict | None = None
+) -> list[tuple[str, str, str | None]]:
+    """
+    Retrieve the top k Reddit posts with their precomputed extracted_information.
+
+    With a reranker, RERANK_CANDIDATES posts are retrieved and only the best
+    reranked ones are returned, so fewer than k posts may reach the LLM.
 
-    return result.get("documents", [[]])[0]
+    Returns:
+        List of (post_id, content, extracted_information) tuples, where
+        extracted_information is None for posts not yet processed by the backfill.
+    """
+    if get_reranker() is None:
+        posts = get_top_k_reddit_posts_with_ids(user_input, k, where)
+    else:
+        candidates = get_top_k_reddit_posts_with_ids(
+            user_input, max(RERANK_CANDIDATES, k), where
+        )
+        posts = rerank_posts(user_input, candidates, k)
+    extracted = DAO.get_instance().get_reddit_posts_extracted_information(
+        [post_id for post_id, _ in posts]
+    )
+    logger.info(
+        "Precomputed extracted_information available for %d/%d posts",
+        len(extracted),
+        len(posts),
+    )
+    return [(post_id, document, extracted.get(post_id)) for post_id, document in posts]
 
 
 def _chunked(items: list[tuple[str, str]], batch_size: int) -> list[list[tuple[str, str]]]:
@@ -111,49 +606,283 @@ def _get_existing_ids(collection: Any, ids: list[str]) -> set[str]:
     return set(existing.get("ids", []))
 
 
-def sync_new_posts(batch_size: int = SYNC_BATCH_SIZE) -> int:
+class SyncProgress:
+    """Thread-safe progress of the running (or last) vector sync."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._status = {"state": "idle"}
+        self._started_at = 0.0
+
+    def start(self, mode: str) -> None:
+        """Reset counters for a new sync."""
+        with self._lock:
+            self._started_at = time.time()
+            self._status = {
+                "state": "running",
+                "mode": mode,
+                "posts_total": None,
+                "posts_scanned": 0,
+                "posts_embedded": 0,
+                "chunks_embedded": 0,
+                "error": None,
+            }
+
+    def set_total(self, posts_total: int) -> None:
+        """Record how many posts the sync will scan."""
+        with self._lock:
+            self._status["posts_total"] = posts_total
+
+    def advance(self, scanned: int, embedded: int = 0, chunks: int = 0) -> None:
+        """Add the posts scanned and embedded by one batch."""
+        with self._lock:
+            self._status["posts_scanned"] += scanned
+            self._status["posts_embedded"] += embedded
+            self._status["chunks_embedded"] += chunks
+
+    def finish(self, error: str | None = None) -> None:
+        """Mark the sync as completed or failed."""
+        with self._lock:
+            self._status["state"] = "failed" if error else "completed"
+            self._status["error"] = error
+            self._status["elapsed_seconds"] = time.time() - self._started_at
+
+    def snapshot(self) -> dict:
+        """Return the current progress with elapsed time and ETA."""
+        with self._lock:
+            status = dict(self._status)
+            if status["state"] != "running":
+                return status
+
+            elapsed = time.time() - self._started_at
+            scanned = status["posts_scanned"]
+            total = status["posts_total"]
+            status["elapsed_seconds"] = elapsed
+            status["eta_seconds"] = (
+                elapsed * (total - scanned) / scanned if scanned and total else None
+            )
+            return status
+
+
+SYNC_PROGRESS = SyncProgress()
+# Held by any sync or rebuild writing to the vector store
+SYNC_LOCK = threading.Lock()
+
+
+def sync_new_posts(batch_size: int = SYNC_BATCH_SIZE, full: bool = False) -> int:
     """
-    Incrementally insert only new posts into ChromaDB.
+    Incrementally insert only new posts into the vector store.
+
+    Posts inserted after the store's date_insertion watermark are indexed, so
+    the cost is proportional to new posts. Without a watermark, or with full,
+    every post ID is reconciled against the store instead. Progress is
+    reported through SYNC_PROGRESS; a sync requested while another one runs
+    is skipped.
 
     Returns:
         Number of newly indexed posts.
     """
-    logger.info("Starting incremental vector sync to Chroma")
-    dao = DAO.get_instance(force_refresh=True)
+    if not SYNC_LOCK.acquire(blocking=False):  # pylint: disable=consider-using-with
+        logger.warning("Vector sync already running, skipping this request")
+        return 0
+
+    try:
+        logger.info("Starting vector sync to %s (full=%s)", VECTOR_BACKEND, full)
+        dao = DAO.get_instance()
+        store = get_vector_store()
+        watermark = None if full else store.get_watermark()
+        SYNC_PROGRESS.start("full" if watermark is None else "watermark")
+        if watermark is None:
+            inserted_count = _reconcile_all_posts(dao, store, batch_size)
+        else:
+            inserted_count = _sync_posts_after_watermark(
+                dao, store, watermark, batch_size
+            )
+        if len(get_lexical_index()) == 0 and store.count() > 0:
+            _build_lexical_index(dao, batch_size)
+        SYNC_PROGRESS.finish()
+        return inserted_count
+    except Exception as error:
+        SYNC_PROGRESS.finish(error=str(error))
+        raise
+    finally:
+        SYNC_LOCK.release()
+
+
+def _sync_posts_after_watermark(
+    dao: DAO, store: Any, watermark: tuple[datetime, str], batch_size: int
+) -> int:
+    """Index posts inserted after the watermark, advancing it batch by batch."""
+    model = get_embedding_model()
+    tokenizer = get_chunk_tokenizer()
+    date_insertion, post_id = watermark
+    SYNC_PROGRESS.set_total(
+        dao.count_reddit_posts_inserted_after(date_insertion, post_id)
+    )
+
+    inserted_count = 0
+    chunk_count = 0
+    while True:
+        rows = dao.get_reddit_posts_inserted_after(
+            date_insertion, post_id, limit=max(batch_size, 1)
+        )
+        if not rows:
+            break
+
+        new_posts = [(row_id, content) for row_id, content, _ in rows if content]
+        batch_chunks = 0
+        if new_posts:
+            batch_chunks = _index_posts(store, model, tokenizer, new_posts)
+            chunk_count += batch_chunks
+            inserted_count += len(new_posts)
+        SYNC_PROGRESS.advance(len(rows), len(new_posts), batch_chunks)
+        post_id, _, date_insertion = rows[-1]
+        store.set_watermark((date_insertion, post_id))
+
+    store.save()
+    get_lexical_index().save()
+    store.refresh_count()
+    logger.info(
+        "Watermark vector sync completed: inserted=%d chunks=%d watermark=%s",
+        inserted_count,
+        chunk_count,
+        date_insertion.isoformat(),
+    )
+    return inserted_count
+
+
+def _reconcile_all_posts(dao: DAO, store: Any, batch_size: int) -> int:
+    """Check every post ID against the store and index the missing ones."""
+    # Taken before the scan so posts inserted meanwhile are caught next sync
+    latest_mark = dao.get_latest_insertion_mark()
     all_post_ids = dao.get_reddit_post_ids()
 
     if not all_post_ids:
         logger.warning("No posts available for vector indexing")
         return 0
 
+    SYNC_PROGRESS.set_total(len(all_post_ids))
     model = get_embedding_model()
-    collection = get_collection()
+    tokenizer = get_chunk_tokenizer()
 
     inserted_count = 0
+    chunk_count = 0
     for batch_ids in _chunked_ids(all_post_ids, max(batch_size, 1)):
-        existing_ids = _get_existing_ids(collection, batch_ids)
-        new_ids = [post_id for post_id in batch_ids if post_id not in existing_ids]
+        # A post is indexed once its first chunk is stored
+        existing_ids = store.existing_ids(
+            [chunking.make_chunk_id(post_id, 0) for post_id in batch_ids]
+        )
+        new_ids = [
+            post_id
+            for post_id in batch_ids
+            if chunking.make_chunk_id(post_id, 0) not in existing_ids
+        ]
 
         if not new_ids:
+            SYNC_PROGRESS.advance(len(batch_ids))
             continue
 
         new_posts = dao.get_reddit_posts_by_ids(new_ids)
         if not new_posts:
+            SYNC_PROGRESS.advance(len(batch_ids))
             continue
 
-        ids = [post_id for post_id, _ in new_posts]
-        documents = [content for _, content in new_posts]
-        embeddings = (
-            model.encode(documents, convert_to_numpy=True, show_progress_bar=False)
-            .astype("float32")
-            .tolist()
-        )
-        collection.upsert(ids=ids, documents=documents, embeddings=embeddings)
-        inserted_count += len(ids)
+        batch_chunks = _index_posts(store, model, tokenizer, new_posts)
+        chunk_count += batch_chunks
+        inserted_count += len(new_posts)
+        SYNC_PROGRESS.advance(len(batch_ids), len(new_posts), batch_chunks)
 
+    if latest_mark is not None:
+        store.set_watermark(latest_mark)
+    store.save()
+    get_lexical_index().save()
+    store.refresh_count()
     logger.info(
-        "Incremental vector sync completed: inserted=%d total_seen=%d",
+        "Full vector reconciliation completed: inserted=%d chunks=%d total_seen=%d",
         inserted_count,
+        chunk_count,
         len(all_post_ids),
     )
     return inserted_count
+
+
+def embed_posts(
+    model: Any,
+    tokenizer: Any,
+    posts: list[tuple[str, str]],
+    cache: EmbeddingCache | None = None,
+    post_metadata: dict[str, dict] | None = None,
+) -> dict:
+    """Chunk and embed posts into the keyword arguments of store.upsert.
+
+    Chunks found in the embedding cache are not re-encoded. Each chunk
+    carries its post_id and the Reddit metadata of its post.
+    """
+    post_metadata = post_metadata or {}
+    chunks = chunking.chunk_posts(posts, tokenizer)
+    documents = [text for _, _, text in chunks]
+    embeddings = encode_with_cache(model, documents, cache)
+    return {
+        "ids": [chunk_id for chunk_id, _, _ in chunks],
+        "documents": documents,
+        "embeddings": embeddings,
+        "metadatas": [
+            {"post_id": post_id, **post_metadata.get(post_id, {})}
+            for _, post_id, _ in chunks
+        ],
+    }
+
+
+def _build_lexical_index(dao: DAO, batch_size: int) -> None:
+    """Fill an empty BM25 index from every post, without encoding anything."""
+    logger.info("BM25 index is empty, building it from all posts")
+    lexical_index = get_lexical_index()
+    tokenizer = get_chunk_tokenizer()
+    batch = []
+    for post_id, content_str in dao.iter_reddit_posts(
+        columns=("id", "content_str"), batch_size=batch_size
+    ):
+        if post_id and content_str:
+            batch.append((post_id, content_str))
+        if len(batch) >= max(batch_size, 1):
+            _add_lexical_chunks(lexical_index, tokenizer, batch)
+            batch = []
+    _add_lexical_chunks(lexical_index, tokenizer, batch)
+    lexical_index.save()
+
+
+def _add_lexical_chunks(
+    lexical_index: BM25Index, tokenizer: Any, posts: list[tuple[str, str]]
+) -> None:
+    """Chunk posts and add the chunks to the BM25 index."""
+    chunks = chunking.chunk_posts(posts, tokenizer)
+    lexical_index.add(
+        [chunk_id for chunk_id, _, _ in chunks], [text for _, _, text in chunks]
+    )
+
+
+def _index_posts(
+    store: Any, model: Any, tokenizer: Any, posts: list[tuple[str, str]]
+) -> int:
+    """Chunk, embed and upsert posts; return the number of chunks written."""
+    cache = get_embedding_cache()
+    post_metadata = DAO.get_instance().get_reddit_posts_metadata(
+        [post_id for post_id, _ in posts]
+    )
+    entries = embed_posts(model, tokenizer, posts, cache, post_metadata)
+    store.upsert(**entries)
+    get_lexical_index().add(entries["ids"], entries["documents"])
+    if cache is not None:
+        cache.add(entries["documents"], entries["embeddings"])
+    return len(entries["ids"])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sync posts to the vector store")
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="reconcile every post ID instead of starting from the watermark",
+    )
+    args = parser.parse_args()
+    sync_new_posts(full=args.full)
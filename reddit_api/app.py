@@ -2,11 +2,14 @@
 
 import asyncio
 import concurrent.futures
+import json
 import os
 import time
+from collections.abc import AsyncIterator
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from pytz import utc
 import uvicorn
@@ -14,19 +17,26 @@ import uvicorn
 from scrapping import background_scrapping
 from adapter import vector_db_adapter
 from adapter import finbot_agent
-from dao import DAO
+from adapter import answer_cache
+from dao import DAO, ExtractedInformationWriter
 from logger_config import logger
 
 scheduler = AsyncIOScheduler(timezone=utc)
-EXTRACTION_MODEL = "nvidia/nemotron-3-super-120b-a12b:free"
+EXTRACTION_MODEL = finbot_agent.DEFAULT_MODEL
 EXTRACTION_WORKERS = 4
 EXTRACTION_BATCH_SIZE = int(os.getenv("EXTRACTION_BATCH_SIZE", "20"))
+# Results are written every EXTRACTION_FLUSH_ROWS rows or EXTRACTION_FLUSH_SECONDS
+EXTRACTION_FLUSH_ROWS = int(os.getenv("EXTRACTION_FLUSH_ROWS", "50"))
+EXTRACTION_FLUSH_SECONDS = float(os.getenv("EXTRACTION_FLUSH_SECONDS", "10"))
 
 
 def _extract_and_store(
-    post_id: str, content_str: str, agent: finbot_agent.FinBotAgent
+    post_id: str,
+    content_str: str,
+    agent: finbot_agent.FinBotAgent,
+    writer: ExtractedInformationWriter,
 ) -> bool:
-    """Extract facts from content and persist into extracted_information."""
+    """Extract facts from content and queue them for extracted_information."""
     if not content_str.strip():
         return False
 
@@ -34,9 +44,8 @@ def _extract_and_store(
     if not extracted:
         return False
 
-    return DAO.get_instance().update_reddit_post_extracted_information(
-        post_id, extracted
-    )
+    writer.add(post_id, extracted)
+    return True
 
 
 def _run_extraction_batch() -> int:
@@ -48,23 +57,41 @@ def _run_extraction_batch() -> int:
     if not rows:
         return 0
 
-    agent = finbot_agent.FinBotAgent(model=EXTRACTION_MODEL, temperature=0.0)
-    updated_count = 0
+    agent = finbot_agent.get_agent(model=EXTRACTION_MODEL, temperature=0.0)
+    writer = ExtractedInformationWriter(
+        dao, EXTRACTION_FLUSH_ROWS, EXTRACTION_FLUSH_SECONDS
+    )
     with concurrent.futures.ThreadPoolExecutor(
         max_workers=EXTRACTION_WORKERS
     ) as executor:
         futures = [
-            executor.submit(_extract_and_store, post_id, content_str, agent)
+            executor.submit(_extract_and_store, post_id, content_str, agent, writer)
             for post_id, content_str in rows
         ]
         for future in concurrent.futures.as_completed(futures):
             try:
-                if future.result():
-                    updated_count += 1
+                future.result()
             except Exception:  # noqa: BLE001
                 logger.exception("One row failed during extracted_information job")
+    writer.flush()
+
+    return writer.updated_count
+
 
-    return updated_count
+async def _initial_vector_sync() -> None:
+    """Load the retrieval models and sync the vector index off the event loop.
+
+    Retrieval keeps serving from the existing index while this runs; progress
+    is exposed on /vector_index/status.
+    """
+    logger.info("Running initial vector index build in the background")
+    try:
+        await asyncio.to_thread(vector_db_adapter.get_query_embedder)
+        await asyncio.to_thread(vector_db_adapter.get_reranker)
+        await asyncio.to_thread(vector_db_adapter.sync_new_posts)
+        logger.info("Initial vector index build completed")
+    except Exception:  # noqa: BLE001
+        logger.exception("Error during initial vector index build")
 
 
 @asynccontextmanager
@@ -75,13 +102,17 @@ async def lifespan(app: FastAPI):
         fastapi_app: The FastAPI application instance.
     """
     logger.info("Starting application lifespan")
-    logger.info("Running initial vector index build")
-    vector_db_adapter.sync_new_posts()
+    initial_sync = asyncio.create_task(_initial_vector_sync())
+    finbot_agent.get_agent()
+    logger.info("Shared chat agent ready")
     scheduler.start()
     logger.info("Scheduler started")
     yield
+    if not initial_sync.done():
+        logger.warning("Shutting down while the initial vector sync is running")
     logger.info("Shutting down scheduler")
     scheduler.shutdown()
+    await finbot_agent.close_agent_pool()
     logger.info("Application lifespan shutdown complete")
 
 
@@ -103,8 +134,26 @@ async def complete_message(input_string: str) -> dict[str, str]:
     start_time = time.time()
     try:
         logger.info("Received /complete_message request")
-        response = finbot_agent.FinBotAgent().run(input_string)
+        cache = answer_cache.get_answer_cache()
+        # Off the loop: the first call may still be loading the model
+        embedder = await asyncio.to_thread(vector_db_adapter.get_query_embedder)
+        question_vector = await embedder.aembed(input_string)
+        cached_response = cache.lookup(question_vector)
+        if cached_response is not None:
+            logger.info(
+                "Request served from answer cache in %.3f seconds",
+                time.time() - start_time,
+            )
+            return {"completed_message": cached_response}
+
+        agent = finbot_agent.get_agent()
+        response, draft = await agent.arun_with_draft_flag(input_string)
         processing_time = time.time() - start_time
+        if draft:
+            # Drafts lack the Reddit context, keep them out of the answer cache
+            logger.info("Draft answer returned in %.3f seconds", processing_time)
+            return {"completed_message": f"{response}", "draft": "true"}
+        cache.store(question_vector, input_string, f"{response}")
         logger.info("Request processed successfully in %.3f seconds", processing_time)
     except Exception:  # noqa: BLE001
         logger.exception("Error during chat invocation")
@@ -113,6 +162,73 @@ async def complete_message(input_string: str) -> dict[str, str]:
     return {"completed_message": f"{response}"}
 
 
+def _sse_event(data: dict, event: str | None = None) -> str:
+    """Format one server-sent event."""
+    prefix = f"event: {event}\n" if event else ""
+    return f"{prefix}data: {json.dumps(data)}\n\n"
+
+
+async def _stream_completion_events(input_string: str) -> AsyncIterator[str]:
+    """Yield the final answer as SSE token events, then a done or error event."""
+    start_time = time.time()
+    first_token_time = None
+    tokens = []
+    try:
+        cache = answer_cache.get_answer_cache()
+        # Off the loop: the first call may still be loading the model
+        embedder = await asyncio.to_thread(vector_db_adapter.get_query_embedder)
+        question_vector = await embedder.aembed(input_string)
+        cached_response = cache.lookup(question_vector)
+        if cached_response is not None:
+            yield _sse_event({"token": cached_response})
+            yield _sse_event({}, event="done")
+            return
+
+        async for token in finbot_agent.get_agent().astream(input_string):
+            if first_token_time is None:
+                first_token_time = time.time() - start_time
+                logger.info("First token streamed after %.3f seconds", first_token_time)
+            tokens.append(token)
+            yield _sse_event({"token": token})
+    except Exception:  # noqa: BLE001
+        logger.exception("Error during streamed chat invocation")
+        yield _sse_event({"error": "Failed to process the request"}, event="error")
+        return
+
+    cache.store(question_vector, input_string, "".join(tokens))
+    logger.info("Stream completed in %.3f seconds", time.time() - start_time)
+    yield _sse_event({}, event="done")
+
+
+@app.get("/complete_message/stream")
+async def complete_message_stream(input_string: str) -> StreamingResponse:
+    """
+    Stream the answer as server-sent events.
+
+    Example call:
+    GET /complete_message/stream?input_string=Hello
+    """
+    logger.info("Received /complete_message/stream request")
+    return StreamingResponse(
+        _stream_completion_events(input_string),
+        media_type="text/event-stream",
+        # Keep NGINX from buffering the whole answer before forwarding it
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.get("/vector_index/status")
+async def get_vector_index_status() -> dict:
+    """Return progress of the running or last vector sync (counts and ETA)."""
+    return vector_db_adapter.SYNC_PROGRESS.snapshot()
+
+
+@app.get("/answer_cache/stats")
+async def get_answer_cache_stats() -> dict[str, float]:
+    """Return hit/miss counters of the semantic answer cache."""
+    return answer_cache.get_answer_cache().stats()
+
+
 @app.get("/reddit_posts/count")
 async def get_reddit_posts_count() -> dict[str, int] | dict[str, str]:
     """Return the number of reddit posts currently stored in the database."""
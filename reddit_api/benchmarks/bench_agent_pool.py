@@ -0,0 +1,90 @@
+"""Compare a fresh FinBotAgent per request against the shared agent pool.
+
+The LLM is the local stub server and retrieval returns fixed posts, so the
+numbers isolate graph compile, client construction and connection reuse.
+
+Run from the reddit_api folder:
+    python -m benchmarks.bench_agent_pool --requests 50 --delay 0.05
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+from benchmarks import stub_llm_server
+from benchmarks import stub_retrieval
+from adapter import finbot_agent
+
+SAMPLE_QUESTION = "Should I fill my TFSA or my RRSP first?"
+
+
+def _percentile(values: list[float], percent: float) -> float:
+    """Return the nearest-rank percentile of values."""
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(percent / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def _report(label: str, overheads: list[float], latencies: list[float]) -> None:
+    """Print overhead and latency figures in milliseconds."""
+    print(
+        f"{label:<18} overhead mean={statistics.mean(overheads) * 1000:8.2f} ms"
+        f"  p50={statistics.median(latencies) * 1000:8.2f} ms"
+        f"  p95={_percentile(latencies, 95) * 1000:8.2f} ms"
+    )
+
+
+def bench_per_request(requests_count: int) -> None:
+    """Build, run and close a new agent on every request (previous behaviour)."""
+    overheads, latencies = [], []
+    for _ in range(requests_count):
+        start = time.perf_counter()
+        agent = finbot_agent.FinBotAgent()
+        built = time.perf_counter()
+        agent.run(SAMPLE_QUESTION)
+        asyncio.run(agent.aclose())
+        overheads.append(built - start)
+        latencies.append(time.perf_counter() - start)
+    _report("per-request agent", overheads, latencies)
+
+
+def bench_pooled(requests_count: int) -> None:
+    """Run every request on the pooled agent built once up front."""
+    finbot_agent.get_agent()
+    overheads, latencies = [], []
+    for _ in range(requests_count):
+        start = time.perf_counter()
+        agent = finbot_agent.get_agent()
+        built = time.perf_counter()
+        agent.run(SAMPLE_QUESTION)
+        overheads.append(built - start)
+        latencies.append(time.perf_counter() - start)
+    _report("pooled agent", overheads, latencies)
+    asyncio.run(finbot_agent.close_agent_pool())
+
+
+def main() -> None:
+    """Start the stub LLM, then run both scenarios."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--delay", type=float, default=0.05)
+    parser.add_argument("--port", type=int, default=8999)
+    args = parser.parse_args()
+
+    server, thread = stub_llm_server.start_in_thread(args.port, args.delay)
+    os.environ["LLM_BASE_URL"] = stub_llm_server.base_url(args.port)
+    os.environ.setdefault("OPEN_ROUTER_KEY", "stub")
+    stub_retrieval.install()
+
+    try:
+        bench_per_request(args.requests)
+        bench_pooled(args.requests)
+    finally:
+        server.should_exit = True
+        thread.join()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Compare rows/sec of per-post inserts and bulk inserts of scraped posts.
+
+Both paths write synthetic posts to a fresh SQLite file through the DAO, so
+no Oracle instance is needed. Bulk inserts are sent by batches of the
+scraper's size.
+
+Run from the reddit_api folder:
+    python -m benchmarks.bench_dao_bulk_insert --posts 5000 --batch-size 50
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from sqlalchemy import create_engine
+
+from dao import DAO
+
+SAMPLE_CONTENT = (
+    "Is XEQT enough on its own in a TFSA or should I add some VFV? "
+    "\n Next comment : XEQT already holds US stocks, keep it simple."
+)
+
+
+def _synthetic_posts(count: int, prefix: str) -> list[dict]:
+    """Return posts shaped like the scraper's, with unique title/author pairs."""
+    return [
+        {
+            "content_str": f"{SAMPLE_CONTENT} #{i}",
+            "title": f"{prefix} post {i}",
+            "author": f"user{i % 97}",
+            "subreddit": "JustBuyXEQT",
+            "score": i % 500,
+            "num_comments": i % 40,
+            "created_utc": 1_700_000_000 + i,
+        }
+        for i in range(count)
+    ]
+
+
+def _fresh_dao(folder: str, name: str) -> DAO:
+    """Return a DAO over a new SQLite file."""
+    engine = create_engine(f"sqlite:///{os.path.join(folder, name)}.db")
+    return DAO(engine=engine)
+
+
+def _report(label: str, rows: int, elapsed: float) -> None:
+    """Print one result row."""
+    print(f"{label:<22} rows={rows:6d}  {elapsed:7.2f} s  {rows / elapsed:9.1f} rows/s")
+
+
+def main() -> None:
+    """Insert the same synthetic posts row by row, then by batches."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--posts", type=int, default=5000)
+    parser.add_argument("--batch-size", type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as folder:
+        dao = _fresh_dao(folder, "per_post")
+        posts = _synthetic_posts(args.posts, "per_post")
+        start = time.perf_counter()
+        for post in posts:
+            dao.add_reddit_post(**post)
+        _report("per-post", dao.get_reddit_posts_count(), time.perf_counter() - start)
+
+        dao = _fresh_dao(folder, "bulk")
+        posts = _synthetic_posts(args.posts, "bulk")
+        start = time.perf_counter()
+        for offset in range(0, len(posts), args.batch_size):
+            dao.add_reddit_posts_bulk(posts[offset : offset + args.batch_size])
+        _report(
+            f"bulk (batch={args.batch_size})",
+            dao.get_reddit_posts_count(),
+            time.perf_counter() - start,
+        )
+
+
+if __name__ == "__main__":
+    main()
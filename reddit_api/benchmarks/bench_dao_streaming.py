@@ -0,0 +1,104 @@
+"""Compare peak memory of loading every post with .all() and streaming them.
+
+A synthetic reddit_posts table is written to a SQLite file, then each read
+path runs in its own process so its peak RSS is measured from a clean start.
+Both paths read the id and content of every post.
+
+Run from the reddit_api folder:
+    python -m benchmarks.bench_dao_streaming --rows 500000
+"""
+
+import argparse
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from sqlalchemy import create_engine
+
+from dao import DAO
+
+READ_MODES = ("all", "iter")
+INSERT_BATCH_SIZE = 5000
+
+
+def _dao(db_path: str) -> DAO:
+    """Return a DAO over the SQLite file."""
+    return DAO(engine=create_engine(f"sqlite:///{db_path}"))
+
+
+def _populate(db_path: str, rows: int, content_chars: int) -> None:
+    """Write rows synthetic posts of content_chars characters each."""
+    dao = _dao(db_path)
+    content = ("Should I hold XEQT in my TFSA or my RRSP? " * content_chars)[
+        :content_chars
+    ]
+    for offset in range(0, rows, INSERT_BATCH_SIZE):
+        dao.add_reddit_posts_bulk(
+            [
+                {"content_str": f"{i} {content}", "title": f"post {i}", "author": "u"}
+                for i in range(offset, min(offset + INSERT_BATCH_SIZE, rows))
+            ]
+        )
+
+
+def _read(db_path: str, mode: str, batch_size: int) -> None:
+    """Read every post with one path and print its count, time and peak RSS."""
+    dao = _dao(db_path)
+    start = time.perf_counter()
+    if mode == "all":
+        posts = [(post.id, post.content_str) for post in dao.get_reddit_posts()]
+        count = len(posts)
+    else:
+        count = sum(
+            1
+            for _ in dao.iter_reddit_posts(
+                columns=("id", "content_str"), batch_size=batch_size
+            )
+        )
+    elapsed = time.perf_counter() - start
+    # ru_maxrss is in kilobytes on Linux
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"{mode:<5} rows={count:7d}  {elapsed:7.2f} s  peak RSS={peak_mb:8.1f} MB")
+
+
+def main() -> None:
+    """Build the synthetic table, then measure each read path in a subprocess."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=500_000)
+    parser.add_argument("--content-chars", type=int, default=1000)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--db", help=argparse.SUPPRESS)
+    parser.add_argument("--mode", choices=READ_MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        _read(args.db, args.mode, args.batch_size)
+        return
+
+    with tempfile.TemporaryDirectory() as folder:
+        db_path = os.path.join(folder, "posts.db")
+        start = time.perf_counter()
+        _populate(db_path, args.rows, args.content_chars)
+        print(f"populated rows={args.rows} in {time.perf_counter() - start:.1f} s")
+        for mode in READ_MODES:
+            subprocess.run(
+                [
+                    sys.executable,
+                    "-m",
+                    "benchmarks.bench_dao_streaming",
+                    "--db",
+                    db_path,
+                    "--mode",
+                    mode,
+                    "--batch-size",
+                    str(args.batch_size),
+                ],
+                check=True,
+            )
+
+
+if __name__ == "__main__":
+    main()
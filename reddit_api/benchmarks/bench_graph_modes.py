@@ -0,0 +1,67 @@
+"""Compare LLM calls per request and latency of the per_post and batched graphs.
+
+The LLM is the local stub server and retrieval returns fixed posts without
+precomputed facts. The extraction cache is cleared before every request so
+each one pays for its extractions.
+
+Run from the reddit_api folder:
+    python -m benchmarks.bench_graph_modes --requests 20 --delay 0.5
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+from benchmarks import stub_llm_server
+from benchmarks import stub_retrieval
+from adapter import finbot_agent
+
+SAMPLE_QUESTION = "Should I fill my TFSA or my RRSP first?"
+
+
+async def _bench_mode(mode: str, requests_count: int, server) -> None:
+    """Run requests one after the other on an agent of the given graph mode."""
+    agent = finbot_agent.FinBotAgent(graph_mode=mode)
+    app_state = server.config.app.state
+    latencies, calls = [], []
+    for _ in range(requests_count):
+        finbot_agent.EXTRACTION_CACHE = finbot_agent.ExtractionCache()
+        calls_before = app_state.request_count
+        start = time.perf_counter()
+        await agent.arun(SAMPLE_QUESTION)
+        latencies.append(time.perf_counter() - start)
+        calls.append(app_state.request_count - calls_before)
+    await agent.aclose()
+
+    print(
+        f"{mode:<9} calls/request={statistics.mean(calls):4.1f}"
+        f"  p50={statistics.median(latencies) * 1000:8.1f} ms"
+        f"  max={max(latencies) * 1000:8.1f} ms"
+    )
+
+
+def main() -> None:
+    """Start the stub LLM, then run both graph modes."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--delay", type=float, default=0.5)
+    parser.add_argument("--port", type=int, default=8999)
+    args = parser.parse_args()
+
+    server, thread = stub_llm_server.start_in_thread(args.port, args.delay)
+    os.environ["LLM_BASE_URL"] = stub_llm_server.base_url(args.port)
+    os.environ.setdefault("OPEN_ROUTER_KEY", "stub")
+    stub_retrieval.install()
+
+    try:
+        for mode in finbot_agent.GRAPH_MODES:
+            asyncio.run(_bench_mode(mode, args.requests, server))
+    finally:
+        server.should_exit = True
+        thread.join()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Compare per-query encode calls with the micro-batching embedder.
+
+Each scenario embeds the same number of queries from a pool of concurrent
+callers; the unbatched one runs model.encode per query like embed_text.
+
+Run from the reddit_api folder:
+    python -m benchmarks.bench_query_embedder --queries 512
+"""
+
+import argparse
+import concurrent.futures
+import time
+
+from adapter import vector_db_adapter
+from adapter.batch_embedder import MicroBatchEmbedder
+
+SAMPLE_QUERIES = [
+    "Should I fill my TFSA or my RRSP first?",
+    "XEQT or VEQT for a 30 year horizon?",
+    "How much emergency fund should I keep in a HISA?",
+    "Is the FHSA worth opening if I might not buy a house?",
+]
+
+
+def _queries_per_second(embed, concurrency: int, queries: int) -> float:
+    """Embed queries from concurrency threads and return the throughput."""
+    texts = [SAMPLE_QUERIES[i % len(SAMPLE_QUERIES)] + f" #{i}" for i in range(queries)]
+    start = time.perf_counter()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(embed, texts))
+    return queries / (time.perf_counter() - start)
+
+
+def main() -> None:
+    """Run both embedders at concurrency 1, 8 and 64."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--queries", type=int, default=512)
+    args = parser.parse_args()
+
+    model = vector_db_adapter.get_embedding_model()
+    embedder = MicroBatchEmbedder(model)
+    model.encode(SAMPLE_QUERIES, show_progress_bar=False)
+
+    for concurrency in (1, 8, 64):
+        unbatched = _queries_per_second(
+            lambda text: vector_db_adapter.embed_text(text, model),
+            concurrency,
+            args.queries,
+        )
+        batched = _queries_per_second(embedder.embed, concurrency, args.queries)
+        print(
+            f"concurrency={concurrency:<3} unbatched={unbatched:8.1f} q/s"
+            f"  micro-batched={batched:8.1f} q/s"
+        )
+
+
+if __name__ == "__main__":
+    main()
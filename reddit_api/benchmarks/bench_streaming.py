@@ -0,0 +1,70 @@
+"""Compare time-to-first-token of the streamed answer with the blocking answer.
+
+Run from the reddit_api folder:
+    python -m benchmarks.bench_streaming --requests 10 --delay 0.5 --token-delay 0.05
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+from benchmarks import stub_llm_server
+from benchmarks import stub_retrieval
+from adapter import finbot_agent
+
+SAMPLE_QUESTION = "Should I fill my TFSA or my RRSP first?"
+
+
+async def _main(requests_count: int) -> None:
+    """Measure arun latency, then astream first-token and total latency."""
+    agent = finbot_agent.get_agent()
+
+    blocking = []
+    for _ in range(requests_count):
+        start = time.perf_counter()
+        await agent.arun(SAMPLE_QUESTION)
+        blocking.append(time.perf_counter() - start)
+
+    first_tokens, totals = [], []
+    for _ in range(requests_count):
+        start = time.perf_counter()
+        first_token = None
+        async for _token in agent.astream(SAMPLE_QUESTION):
+            if first_token is None:
+                first_token = time.perf_counter() - start
+        first_tokens.append(first_token or 0.0)
+        totals.append(time.perf_counter() - start)
+
+    print(f"blocking answer   p50={statistics.median(blocking) * 1000:8.1f} ms")
+    print(f"streamed first    p50={statistics.median(first_tokens) * 1000:8.1f} ms")
+    print(f"streamed complete p50={statistics.median(totals) * 1000:8.1f} ms")
+    await finbot_agent.close_agent_pool()
+
+
+def main() -> None:
+    """Start the stub LLM server and run the comparison."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=10)
+    parser.add_argument("--delay", type=float, default=0.5)
+    parser.add_argument("--token-delay", type=float, default=0.05)
+    parser.add_argument("--port", type=int, default=8999)
+    args = parser.parse_args()
+
+    server, thread = stub_llm_server.start_in_thread(
+        args.port, args.delay, args.token_delay
+    )
+    os.environ["LLM_BASE_URL"] = stub_llm_server.base_url(args.port)
+    os.environ.setdefault("OPEN_ROUTER_KEY", "stub")
+    stub_retrieval.install()
+
+    try:
+        asyncio.run(_main(args.requests))
+    finally:
+        server.should_exit = True
+        thread.join()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""Compare recall@5 and query latency of Chroma and FAISS on the real corpus.
+
+Embeddings are read back from the Chroma collection, so no re-encoding is
+needed. Ground truth is an exact L2 search in numpy. Queries are the
+embeddings of the first characters of randomly sampled posts.
+
+Run from the reddit_api folder (Chroma must be reachable):
+    python -m benchmarks.bench_vector_backends --queries 200
+"""
+
+import argparse
+import random
+import statistics
+import tempfile
+import time
+
+import numpy as np
+
+from adapter import vector_db_adapter
+from adapter.faiss_index import FaissPostIndex
+
+TOP_K = 5
+PAGE_SIZE = 5000
+
+
+def _load_corpus() -> tuple[list[str], np.ndarray]:
+    """Page through the Chroma collection and return its IDs and embeddings."""
+    collection = vector_db_adapter.get_collection()
+    ids, embeddings = [], []
+    offset = 0
+    while True:
+        page = collection.get(include=["embeddings"], limit=PAGE_SIZE, offset=offset)
+        if not page["ids"]:
+            break
+        ids.extend(page["ids"])
+        embeddings.extend(page["embeddings"])
+        offset += len(page["ids"])
+    return ids, np.asarray(embeddings, dtype="float32")
+
+
+def _recall(found: list[list[str]], expected: list[list[str]]) -> float:
+    """Return the mean fraction of exact top-k IDs found."""
+    return statistics.mean(
+        len(set(f) & set(e)) / len(e) for f, e in zip(found, expected)
+    )
+
+
+def _report(label: str, build: float, latencies: list[float], recall: float) -> None:
+    """Print one result row."""
+    p50 = statistics.median(latencies) * 1000
+    p95 = sorted(latencies)[int(len(latencies) * 0.95)] * 1000
+    print(
+        f"{label:<8} build={build:7.2f} s  p50={p50:7.2f} ms  p95={p95:7.2f} ms"
+        f"  recall@{TOP_K}={recall:.3f}"
+    )
+
+
+def main() -> None:
+    """Build each FAISS index type from the Chroma vectors and search them."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    ids, vectors = _load_corpus()
+    print(f"corpus={len(ids)} posts dim={vectors.shape[1]}")
+
+    collection = vector_db_adapter.get_collection()
+    sample = random.Random(args.seed).sample(ids, min(args.queries, len(ids)))
+    documents = collection.get(ids=sample, include=["documents"])["documents"]
+    model = vector_db_adapter.get_embedding_model()
+    queries = model.encode(
+        [document[:300] for document in documents],
+        convert_to_numpy=True,
+        show_progress_bar=False,
+    ).astype("float32")
+
+    distances = (
+        (queries**2).sum(axis=1)[:, None]
+        - 2 * queries @ vectors.T
+        + (vectors**2).sum(axis=1)[None, :]
+    )
+    expected = [[ids[i] for i in np.argsort(row)[:TOP_K]] for row in distances]
+
+    latencies, found = [], []
+    for query in queries:
+        start = time.perf_counter()
+        result = collection.query(
+            query_embeddings=[query.tolist()], n_results=TOP_K, include=[]
+        )
+        latencies.append(time.perf_counter() - start)
+        found.append(result["ids"][0])
+    _report("chroma", 0.0, latencies, _recall(found, expected))
+
+    for index_type in ("flat", "ivf", "hnsw"):
+        with tempfile.TemporaryDirectory() as index_dir:
+            start = time.perf_counter()
+            index = FaissPostIndex(index_dir, index_type)
+            index.upsert(ids, [], vectors)
+            index.save()
+            build = time.perf_counter() - start
+            index = FaissPostIndex(index_dir, index_type)
+
+            latencies, found = [], []
+            for query in queries:
+                start = time.perf_counter()
+                found.append(index.search_ids(query, TOP_K))
+                latencies.append(time.perf_counter() - start)
+            _report(index_type, build, latencies, _recall(found, expected))
+
+
+if __name__ == "__main__":
+    main()
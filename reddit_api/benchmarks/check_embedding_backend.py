@@ -0,0 +1,95 @@
+"""Check that an ONNX embedding backend agrees with the PyTorch model, and time it.
+
+The agreement check fails (exit code 1) when any sample's cosine similarity
+with the PyTorch vector is under --min-cosine, since vectors must stay
+compatible with the existing Chroma collection. Cold start, RSS and latency
+are measured in a fresh process per backend.
+
+Run from the reddit_api folder:
+    python -m benchmarks.check_embedding_backend --backend onnx-int8
+"""
+
+import argparse
+import resource
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+from adapter import vector_db_adapter
+
+SAMPLE_TEXTS = [
+    "Should I fill my TFSA or my RRSP first?",
+    "XEQT or VEQT for a 30 year horizon?",
+    "How much emergency fund should I keep in a HISA?",
+    "Is the FHSA worth opening if I might not buy a house?",
+    "I maxed my TFSA with XEQT and now I am wondering whether the RRSP "
+    "deduction is worth it at a 30% marginal rate.\n Next comment : "
+    "Yes if you expect a lower rate in retirement, otherwise keep the TFSA.",
+]
+
+
+def _measure(backend: str) -> None:
+    """Print cold start, peak RSS and single-query latency for one backend."""
+    start = time.perf_counter()
+    model = vector_db_adapter.load_embedding_model(backend)
+    model.encode(SAMPLE_TEXTS[0], convert_to_numpy=True, show_progress_bar=False)
+    cold_start = time.perf_counter() - start
+
+    latencies = []
+    for _ in range(20):
+        for text in SAMPLE_TEXTS:
+            query_start = time.perf_counter()
+            model.encode(text, convert_to_numpy=True, show_progress_bar=False)
+            latencies.append(time.perf_counter() - query_start)
+
+    peak_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(
+        f"{backend:<10} cold_start={cold_start:6.2f} s  peak_rss={peak_rss_mb:7.1f} MB"
+        f"  p50_query={np.median(latencies) * 1000:6.2f} ms"
+    )
+
+
+def _agreement(backend: str) -> float:
+    """Return the smallest cosine similarity between torch and backend vectors."""
+    reference = vector_db_adapter.load_embedding_model("torch").encode(
+        SAMPLE_TEXTS, convert_to_numpy=True, show_progress_bar=False
+    )
+    candidate = vector_db_adapter.load_embedding_model(backend).encode(
+        SAMPLE_TEXTS, convert_to_numpy=True, show_progress_bar=False
+    )
+    cosines = (reference * candidate).sum(axis=1) / (
+        np.linalg.norm(reference, axis=1) * np.linalg.norm(candidate, axis=1)
+    )
+    print(f"cosine agreement min={cosines.min():.4f} mean={cosines.mean():.4f}")
+    return float(cosines.min())
+
+
+def main() -> None:
+    """Run the agreement check, then measure torch and the backend separately."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--backend", default="onnx-int8")
+    parser.add_argument("--min-cosine", type=float, default=0.98)
+    parser.add_argument("--measure", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        _measure(args.measure)
+        return
+
+    min_cosine = _agreement(args.backend)
+    for backend in ("torch", args.backend):
+        subprocess.run(
+            [sys.executable, "-m", "benchmarks.check_embedding_backend"]
+            + ["--measure", backend],
+            check=True,
+        )
+
+    if min_cosine < args.min_cosine:
+        print(f"FAILED: cosine {min_cosine:.4f} < {args.min_cosine}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Load test showing how many concurrent chats one event loop can serve.
+
+Both scenarios run N chats concurrently on a single asyncio loop, like one
+uvicorn worker. The blocking scenario calls the synchronous ``run`` inside the
+coroutine (previous behaviour); the async scenario awaits ``arun``.
+
+Run from the reddit_api folder:
+    python -m benchmarks.load_test_complete_message --concurrency 32 --delay 1.0
+"""
+
+import argparse
+import asyncio
+import os
+import time
+
+from benchmarks import stub_llm_server
+from benchmarks import stub_retrieval
+from adapter import finbot_agent
+
+SAMPLE_QUESTION = "Should I fill my TFSA or my RRSP first?"
+
+
+async def _blocking_chat(agent: finbot_agent.FinBotAgent) -> str:
+    """Chat the way the endpoint used to: a sync call inside a coroutine."""
+    return agent.run(SAMPLE_QUESTION)
+
+
+async def _async_chat(agent: finbot_agent.FinBotAgent) -> str:
+    """Chat through the async graph."""
+    return await agent.arun(SAMPLE_QUESTION)
+
+
+async def _load(label: str, chat, concurrency: int) -> None:
+    """Fire concurrency chats at once and report wall time and throughput."""
+    agent = finbot_agent.get_agent()
+    start = time.perf_counter()
+    await asyncio.gather(*[chat(agent) for _ in range(concurrency)])
+    elapsed = time.perf_counter() - start
+    print(
+        f"{label:<10} concurrency={concurrency:<4} wall={elapsed:8.2f} s"
+        f"  throughput={concurrency / elapsed:8.2f} chats/s"
+    )
+
+
+async def _main(concurrency: int) -> None:
+    """Run both scenarios on the same loop, then release the agent pool."""
+    await _load("blocking", _blocking_chat, concurrency)
+    await _load("async", _async_chat, concurrency)
+    await finbot_agent.close_agent_pool()
+
+
+def main() -> None:
+    """Start the stub LLM server and run the load test."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--delay", type=float, default=1.0)
+    parser.add_argument("--port", type=int, default=8999)
+    args = parser.parse_args()
+
+    server, thread = stub_llm_server.start_in_thread(args.port, args.delay)
+    os.environ["LLM_BASE_URL"] = stub_llm_server.base_url(args.port)
+    os.environ.setdefault("OPEN_ROUTER_KEY", "stub")
+    stub_retrieval.install()
+
+    try:
+        asyncio.run(_main(args.concurrency))
+    finally:
+        server.should_exit = True
+        thread.join()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""Minimal OpenAI-compatible chat completion server used by the benchmarks.
+
+Run standalone from the reddit_api folder:
+    python -m benchmarks.stub_llm_server --port 8999 --delay 0.5
+"""
+
+import argparse
+import asyncio
+import json
+import threading
+import time
+
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+import uvicorn
+
+STUB_ANSWER = (
+    "- Diversification lowers single-stock risk.\n"
+    "- A TFSA grows tax free and withdrawals are not taxed.\n"
+    "- An RRSP contribution reduces taxable income for the year."
+)
+
+
+def _stream_chunks(model: str, delay_seconds: float, token_delay_seconds: float):
+    """Yield the stub answer word by word as OpenAI chat.completion.chunk events."""
+
+    def chunk(delta: dict, finish_reason: str | None = None) -> str:
+        body = {
+            "id": "chatcmpl-stub",
+            "object": "chat.completion.chunk",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+        }
+        return f"data: {json.dumps(body)}\n\n"
+
+    async def events():
+        await asyncio.sleep(delay_seconds)
+        yield chunk({"role": "assistant", "content": ""})
+        for word in STUB_ANSWER.split(" "):
+            yield chunk({"content": f"{word} "})
+            await asyncio.sleep(token_delay_seconds)
+        yield chunk({}, finish_reason="stop")
+        yield "data: [DONE]\n\n"
+
+    return events()
+
+
+def create_app(
+    delay_seconds: float = 0.5, token_delay_seconds: float = 0.0
+) -> FastAPI:
+    """Create the stub app answering every chat completion after a fixed delay.
+
+    Args:
+        delay_seconds: Simulated LLM latency before the first token.
+        token_delay_seconds: Simulated delay between generated words.
+
+    Returns:
+        The FastAPI application; ``state.request_count`` counts the completions.
+    """
+    stub_app = FastAPI()
+    stub_app.state.request_count = 0
+
+    @stub_app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        stub_app.state.request_count += 1
+        payload = await request.json()
+        model = payload.get("model", "stub")
+        if payload.get("stream"):
+            return StreamingResponse(
+                _stream_chunks(model, delay_seconds, token_delay_seconds),
+                media_type="text/event-stream",
+            )
+
+        await asyncio.sleep(
+            delay_seconds + token_delay_seconds * len(STUB_ANSWER.split(" "))
+        )
+        return {
+            "id": "chatcmpl-stub",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [
+                {
+                    "index": 0,
+                    "message": {"role": "assistant", "content": STUB_ANSWER},
+                    "finish_reason": "stop",
+                }
+            ],
+            "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+        }
+
+    return stub_app
+
+
+def start_in_thread(
+    port: int = 8999, delay_seconds: float = 0.5, token_delay_seconds: float = 0.0
+) -> tuple[uvicorn.Server, threading.Thread]:
+    """Start the stub server on a daemon thread and wait until it accepts requests.
+
+    Returns:
+        The uvicorn server (set ``should_exit`` to stop it) and its thread.
+    """
+    config = uvicorn.Config(
+        create_app(delay_seconds, token_delay_seconds),
+        host="127.0.0.1",
+        port=port,
+        log_level="warning",
+    )
+    server = uvicorn.Server(config)
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+    return server, thread
+
+
+def base_url(port: int) -> str:
+    """Return the OpenAI base URL to give to ChatOpenAI for a stub port."""
+    return f"http://127.0.0.1:{port}/v1"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--port", type=int, default=8999)
+    parser.add_argument("--delay", type=float, default=0.5)
+    parser.add_argument("--token-delay", type=float, default=0.0)
+    args = parser.parse_args()
+    uvicorn.run(
+        create_app(args.delay, args.token_delay), host="127.0.0.1", port=args.port
+    )
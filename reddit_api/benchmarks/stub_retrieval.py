@@ -0,0 +1,21 @@
+"""Fixed retrieval results so agent benchmarks need neither Chroma nor Oracle."""
+
+from adapter import vector_db_adapter
+
+SAMPLE_POSTS = [
+    ("stub-post-1", "Maxing the TFSA before the RRSP makes sense at a low income."),
+    ("stub-post-2", "XEQT holds about 9000 stocks across the world for 0.20% MER."),
+]
+
+
+def _get_top_k_reddit_post_contexts(
+    user_input: str, k: int = 5
+) -> list[tuple[str, str, str | None]]:
+    """Return the sample posts without precomputed extracted_information."""
+    del user_input
+    return [(post_id, content, None) for post_id, content in SAMPLE_POSTS[:k]]
+
+
+def install() -> None:
+    """Replace the vector DB retrieval used by the agent with the sample posts."""
+    vector_db_adapter.get_top_k_reddit_post_contexts = _get_top_k_reddit_post_contexts
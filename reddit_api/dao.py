@@ -2,21 +2,113 @@
 
 import os
 import hashlib
+import threading
+import time
+from collections.abc import Iterator, Sequence
+from datetime import datetime, timezone
 
+import oracledb
 from dotenv import load_dotenv
-from sqlalchemy import create_engine, text
+from sqlalchemy import (
+    TIMESTAMP,
+    Integer,
+    String,
+    Text,
+    and_,
+    bindparam,
+    create_engine,
+    or_,
+    select,
+    text,
+    update,
+)
+from sqlalchemy.dialects import sqlite
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import declarative_base, sessionmaker
+from sqlalchemy.pool import NullPool
 
 from models import RedditPost
 from logger_config import logger
 
+load_dotenv()
+
 Base = declarative_base()
+# oracle (default) or sqlite, a local stand-in for benchmarks and development
+DB_BACKEND = os.getenv("DB_BACKEND", "oracle")
+SQLITE_DB_PATH = os.getenv("SQLITE_DB_PATH", "static/finbot.db")
+DB_POOL_MIN = int(os.getenv("DB_POOL_MIN", "1"))
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "8"))
+# Seconds a pooled Oracle session may idle before it is pinged on acquire
+DB_POOL_PING_INTERVAL = int(os.getenv("DB_POOL_PING_INTERVAL", "60"))
+DB_STATEMENT_CACHE_SIZE = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "50"))
+# Rows fetched per Oracle round trip (cursor.arraysize) when streaming
+DB_FETCH_ARRAYSIZE = int(os.getenv("DB_FETCH_ARRAYSIZE", "1000"))
+DB_BACKENDS = ("oracle", "sqlite")
+
+# Reddit metadata columns added after the table was first created
+POST_METADATA_COLUMNS = {
+    "SUBREDDIT": "VARCHAR2(100)",
+    "SCORE": "NUMBER(10)",
+    "NUM_COMMENTS": "NUMBER(10)",
+    "CREATED_UTC": "TIMESTAMP",
+}
+
+
+def _inserted_after(date_insertion: datetime, post_id: str):
+    """Filter rows strictly after a (date_insertion, id) mark."""
+    return or_(
+        RedditPost.date_insertion > date_insertion,
+        and_(
+            RedditPost.date_insertion == date_insertion,
+            RedditPost.id > post_id,
+        ),
+    )
+
+
+def create_db_engine(backend: str = DB_BACKEND) -> Engine:
+    """Create the long-lived engine of the configured database backend.
+
+    Oracle connections come from an oracledb session pool with its own
+    statement cache and liveness ping, so SQLAlchemy does not pool them.
+
+    Args:
+        backend: One of DB_BACKENDS.
+    """
+    if backend == "oracle":
+        logger.info("Creating Oracle session pool with max=%d sessions", DB_POOL_SIZE)
+        pool = oracledb.create_pool(
+            user=os.getenv("ORACLE_USER"),
+            password=os.getenv("ORACLE_PASSWORD"),
+            dsn=os.getenv("ORACLE_DSN"),
+            min=min(DB_POOL_MIN, DB_POOL_SIZE),
+            max=DB_POOL_SIZE,
+            increment=1,
+            ping_interval=DB_POOL_PING_INTERVAL,
+            stmtcachesize=DB_STATEMENT_CACHE_SIZE,
+        )
+        return create_engine(
+            "oracle+oracledb://",
+            creator=pool.acquire,
+            poolclass=NullPool,
+            arraysize=DB_FETCH_ARRAYSIZE,
+        )
+    if backend == "sqlite":
+        logger.info("Using SQLite database at %s", SQLITE_DB_PATH)
+        os.makedirs(os.path.dirname(SQLITE_DB_PATH) or ".", exist_ok=True)
+        return create_engine(
+            f"sqlite:///{SQLITE_DB_PATH}",
+            connect_args={"check_same_thread": False},
+            pool_size=DB_POOL_SIZE,
+            pool_pre_ping=True,
+        )
+    raise ValueError(f"DB_BACKEND must be one of {DB_BACKENDS}, got {backend}")
 
 
 class Singleton:  # pylint: disable=too-few-public-methods
     """Singleton pattern implementation for ensuring single instance."""
 
     _instances = {}
+    _lock = threading.Lock()
 
     @classmethod
     def get_instance(cls, *args, **kwargs) -> "Singleton":
@@ -29,28 +121,35 @@ class Singleton:  # pylint: disable=too-few-public-methods
             The singleton instance of the class.
         """
         force_refresh = kwargs.pop("force_refresh", False)
-        if force_refresh or cls not in cls._instances:
-            cls._instances[cls] = cls(*args, **kwargs)
-        return cls._instances[cls]
+        with cls._lock:
+            if force_refresh or cls not in cls._instances:
+                cls._instances[cls] = cls(*args, **kwargs)
+            return cls._instances[cls]
 
 
 class DAO(Singleton):
-    """Data Access Object for Reddit posts storage and retrieval."""
-
-    load_dotenv()
-
-    def __init__(self) -> None:
-        """Initialize DAO with Oracle database connection."""
-        logger.info("Initializing DAO and Oracle connection")
-        password = os.getenv("ORACLE_PASSWORD")
-        dsn = os.getenv("ORACLE_DSN")
-        user = os.getenv("ORACLE_USER")
-        self.engine = create_engine(
-            "oracle+oracledb://:@",
-            connect_args={"user": user, "password": password, "dsn": dsn},
-        )
-        Base.metadata.create_all(self.engine)
-        self._ensure_extracted_information_column()
+    """Data Access Object for Reddit posts storage and retrieval.
+
+    The shared instance is meant to live for the whole process: its engine
+    holds the connection pool and the schema checks run once.
+    """
+
+    def __init__(self, engine: Engine | None = None) -> None:
+        """Initialize DAO with the configured database backend.
+
+        Args:
+            engine: Engine to use instead of the DB_BACKEND one, e.g. a local
+                SQLite file for benchmarks. Its tables are created from the models.
+        """
+        logger.info("Initializing DAO")
+        self.engine = engine if engine is not None else create_db_engine()
+        if self.engine.dialect.name == "oracle":
+            Base.metadata.create_all(self.engine)
+            self._ensure_extracted_information_column()
+            self._ensure_post_metadata_columns()
+            self._ensure_date_insertion_index()
+        else:
+            RedditPost.metadata.create_all(self.engine)
         self.session_maker = sessionmaker(bind=self.engine)
         logger.info("DAO initialized and database metadata ensured")
 
@@ -72,22 +171,86 @@ class DAO(Singleton):
                 connection.execute(alter)
                 logger.info("Added missing column reddit_posts.extracted_information")
 
-    def add_reddit_post(self, content_str: str, title: str, author: str) -> None:
+    def _ensure_post_metadata_columns(self) -> None:
+        """Ensure the Reddit metadata columns exist for existing databases."""
+        query = text(
+            """
+            SELECT column_name
+            FROM user_tab_columns
+            WHERE table_name = 'REDDIT_POSTS'
+            """
+        )
+
+        with self.engine.begin() as connection:
+            existing = {row[0] for row in connection.execute(query)}
+            for column, column_type in POST_METADATA_COLUMNS.items():
+                if column not in existing:
+                    connection.execute(
+                        text(f"ALTER TABLE reddit_posts ADD ({column} {column_type})")
+                    )
+                    logger.info("Added missing column reddit_posts.%s", column.lower())
+
+    def _ensure_date_insertion_index(self) -> None:
+        """Ensure an index backs the date_insertion scans of the vector sync."""
+        query = text(
+            """
+            SELECT COUNT(*)
+            FROM user_ind_columns
+            WHERE table_name = 'REDDIT_POSTS'
+              AND column_name = 'DATE_INSERTION'
+            """
+        )
+        create = text(
+            "CREATE INDEX reddit_posts_date_ins_idx "
+            "ON reddit_posts (date_insertion, id)"
+        )
+
+        with self.engine.begin() as connection:
+            exists = int(connection.execute(query).scalar() or 0)
+            if exists == 0:
+                connection.execute(create)
+                logger.info("Created index reddit_posts_date_ins_idx")
+
+    def add_reddit_post(  # pylint: disable=too-many-arguments
+        self,
+        content_str: str,
+        title: str,
+        author: str,
+        *,
+        subreddit: str | None = None,
+        score: int | None = None,
+        num_comments: int | None = None,
+        created_utc: float | None = None,
+    ) -> None:
         """Add a Reddit post to the database.
 
         Args:
             content_str: The post content as string.
             title: The post title.
             author: The post author.
+            subreddit: Subreddit the post was scraped from.
+            score: Reddit score of the post.
+            num_comments: Number of comments of the post.
+            created_utc: Reddit creation time as a UTC epoch timestamp.
         """
-        from datetime import datetime  # pylint: disable=import-outside-toplevel
-
         session = self.session_maker()
         try:
             post_id = self.generate_post_id(title=title, author=author)
 
             post = RedditPost(
-                id=post_id, content_str=content_str, date_insertion=datetime.now()
+                id=post_id,
+                content_str=content_str,
+                date_insertion=datetime.now(),
+                subreddit=subreddit,
+                score=score,
+                num_comments=num_comments,
+                created_utc=(
+                    datetime.fromtimestamp(created_utc, timezone.utc).replace(
+                        tzinfo=None
+                    )
+                    if created_utc is not None
+                    else None
+                ),
             )
             session.add(post)
             session.commit()
@@ -98,6 +261,86 @@ class DAO(Singleton):
         finally:
             session.close()
 
+    def _post_row(self, post: dict, date_insertion: datetime) -> dict:
+        """Build the column values of one scraped post."""
+        created_utc = post.get("created_utc")
+        return {
+            "id": self.generate_post_id(title=post["title"], author=post["author"]),
+            "content_str": post["content_str"],
+            "date_insertion": date_insertion,
+            "subreddit": post.get("subreddit"),
+            "score": post.get("score"),
+            "num_comments": post.get("num_comments"),
+            "created_utc": (
+                datetime.fromtimestamp(created_utc, timezone.utc).replace(tzinfo=None)
+                if created_utc is not None
+                else None
+            ),
+        }
+
+    def _insert_ignore_statement(self):
+        """Return an insert statement skipping IDs already stored, per dialect."""
+        table = RedditPost.__table__
+        dialect = self.engine.dialect.name
+        if dialect == "oracle":
+            # Array-bound MERGE; typed binds keep long content as a CLOB
+            return text(
+                """
+                MERGE INTO reddit_posts target
+                USING (SELECT :id AS id FROM dual) source
+                ON (target.id = source.id)
+                WHEN NOT MATCHED THEN INSERT
+                    (id, content_str, date_insertion, subreddit, score,
+                     num_comments, created_utc)
+                VALUES
+                    (:id, :content_str, :date_insertion, :subreddit, :score,
+                     :num_comments, :created_utc)
+                """
+            ).bindparams(
+                bindparam("id", type_=String(100)),
+                bindparam("content_str", type_=Text()),
+                bindparam("date_insertion", type_=TIMESTAMP()),
+                bindparam("subreddit", type_=String(100)),
+                bindparam("score", type_=Integer()),
+                bindparam("num_comments", type_=Integer()),
+                bindparam("created_utc", type_=TIMESTAMP()),
+            )
+        if dialect == "sqlite":
+            return sqlite.insert(table).on_conflict_do_nothing(index_elements=["id"])
+        raise ValueError(f"Bulk insert is not supported for dialect={dialect}")
+
+    def add_reddit_posts_bulk(self, posts: list[dict]) -> int:
+        """Insert many posts in one transaction, skipping IDs already stored.
+
+        Rows are sent with a single executemany (an Oracle array MERGE).
+
+        Args:
+            posts: Dicts with content_str, title and author, and optionally
+                subreddit, score, num_comments and created_utc.
+
+        Returns:
+            Number of inserted posts.
+        """
+        if not posts:
+            return 0
+
+        now = datetime.now()
+        rows = {}
+        for post in posts:
+            row = self._post_row(post, now)
+            rows.setdefault(row["id"], row)
+        try:
+            with self.engine.begin() as connection:
+                result = connection.execute(
+                    self._insert_ignore_statement(), list(rows.values())
+                )
+            inserted = max(result.rowcount, 0)
+            logger.info("Bulk inserted %d/%d reddit posts", inserted, len(posts))
+            return inserted
+        except (ValueError, KeyError, AttributeError):
+            logger.exception("Failed to bulk insert reddit posts")
+            return 0
+
     def get_reddit_posts(self) -> list["RedditPost"] | None:
         """Retrieve all Reddit posts from the database.
 
@@ -116,6 +359,40 @@ class DAO(Singleton):
         finally:
             session.close()
 
+    def iter_reddit_posts(
+        self,
+        columns: Sequence[str] = ("id", "content_str"),
+        batch_size: int = DB_FETCH_ARRAYSIZE,
+    ) -> Iterator[tuple]:
+        """Stream reddit posts as tuples of the selected columns.
+
+        Rows come from a server-side cursor read batch_size rows at a time,
+        so memory stays flat whatever the number of posts.
+
+        Args:
+            columns: reddit_posts column names, in tuple order.
+            batch_size: Rows buffered per fetch.
+
+        Yields:
+            One tuple per post.
+        """
+        table = RedditPost.__table__
+        try:
+            statement = select(*(table.c[name] for name in columns))
+        except KeyError as exc:
+            raise ValueError(f"Unknown reddit_posts column: {exc}") from exc
+
+        count = 0
+        with self.engine.connect() as connection:
+            result = connection.execution_options(
+                yield_per=max(batch_size, 1)
+            ).execute(statement)
+            for partition in result.partitions():
+                for row in partition:
+                    yield tuple(row)
+                count += len(partition)
+        logger.info("Streamed %d reddit posts from database", count)
+
     def get_reddit_post_ids(self) -> list[str]:
         """Retrieve all reddit post IDs from the database."""
         session = self.session_maker()
@@ -131,6 +408,75 @@ class DAO(Singleton):
         finally:
             session.close()
 
+    def get_latest_insertion_mark(self) -> tuple[datetime, str] | None:
+        """Return (date_insertion, id) of the most recently inserted post."""
+        session = self.session_maker()
+        try:
+            row = (
+                session.query(RedditPost.date_insertion, RedditPost.id)
+                .order_by(RedditPost.date_insertion.desc(), RedditPost.id.desc())
+                .first()
+            )
+            return (row[0], row[1]) if row else None
+        except (ValueError, KeyError, AttributeError):
+            logger.exception("Failed to fetch latest insertion mark")
+            session.rollback()
+            return None
+        finally:
+            session.close()
+
+    def get_reddit_posts_inserted_after(
+        self,
+        date_insertion: datetime | None,
+        post_id: str = "",
+        limit: int = 1000,
+    ) -> list[tuple[str, str, datetime]]:
+        """Fetch posts inserted after a (date_insertion, id) mark, oldest first.
+
+        The id tie-break makes the mark exact when several posts share a
+        timestamp, so pages can be walked without skipping or repeating rows.
+
+        Returns:
+            List of (id, content_str, date_insertion) tuples.
+        """
+        session = self.session_maker()
+        try:
+            query = session.query(
+                RedditPost.id, RedditPost.content_str, RedditPost.date_insertion
+            )
+            if date_insertion is not None:
+                query = query.filter(_inserted_after(date_insertion, post_id))
+            rows = (
+                query.order_by(RedditPost.date_insertion, RedditPost.id)
+                .limit(max(limit, 1))
+                .all()
+            )
+            logger.info("Fetched %d reddit posts inserted after mark", len(rows))
+            return [(row[0], row[1], row[2]) for row in rows if row[0]]
+        except (ValueError, KeyError, AttributeError):
+            logger.exception("Failed to fetch reddit posts inserted after mark")
+            session.rollback()
+            return []
+        finally:
+            session.close()
+
+    def count_reddit_posts_inserted_after(
+        self, date_insertion: datetime | None, post_id: str = ""
+    ) -> int:
+        """Count posts inserted after a (date_insertion, id) mark."""
+        session = self.session_maker()
+        try:
+            query = session.query(RedditPost.id)
+            if date_insertion is not None:
+                query = query.filter(_inserted_after(date_insertion, post_id))
+            return query.count()
+        except (ValueError, KeyError, AttributeError):
+            logger.exception("Failed to count reddit posts inserted after mark")
+            session.rollback()
+            return 0
+        finally:
+            session.close()
+
     def get_reddit_posts_count(self) -> int:
         """Retrieve the total number of reddit posts in the database."""
         session = self.session_maker()
@@ -167,6 +513,75 @@ class DAO(Singleton):
         finally:
             session.close()
 
+    def get_reddit_posts_metadata(self, post_ids: list[str]) -> dict[str, dict]:
+        """Map post IDs to their non-null Reddit metadata.
+
+        Returns:
+            Dict of post ID to a dict with subreddit, score, num_comments and
+            created_utc (UTC epoch seconds) when known.
+        """
+        if not post_ids:
+            return {}
+
+        session = self.session_maker()
+        try:
+            rows = (
+                session.query(
+                    RedditPost.id,
+                    RedditPost.subreddit,
+                    RedditPost.score,
+                    RedditPost.num_comments,
+                    RedditPost.created_utc,
+                )
+                .filter(RedditPost.id.in_(post_ids))
+                .all()
+            )
+            metadata = {}
+            for post_id, subreddit, score, num_comments, created_utc in rows:
+                values = {
+                    "subreddit": subreddit,
+                    "score": score,
+                    "num_comments": num_comments,
+                    "created_utc": (
+                        int(created_utc.replace(tzinfo=timezone.utc).timestamp())
+                        if created_utc is not None
+                        else None
+                    ),
+                }
+                metadata[post_id] = {
+                    key: value for key, value in values.items() if value is not None
+                }
+            return metadata
+        except (ValueError, KeyError, AttributeError):
+            logger.exception("Failed to fetch reddit post metadata by IDs")
+            session.rollback()
+            return {}
+        finally:
+            session.close()
+
+    def get_reddit_posts_extracted_information(
+        self, post_ids: list[str]
+    ) -> dict[str, str]:
+        """Map post IDs to their non-null extracted_information."""
+        if not post_ids:
+            return {}
+
+        session = self.session_maker()
+        try:
+            rows = (
+                session.query(RedditPost.id, RedditPost.extracted_information)
+                .filter(RedditPost.id.in_(post_ids))
+                .filter(RedditPost.extracted_information.isnot(None))
+                .all()
+            )
+            return {row[0]: row[1] for row in rows if row[0] and row[1]}
+        except (ValueError, KeyError, AttributeError):
+            logger.exception("Failed to fetch extracted_information by IDs")
+            session.rollback()
+            return {}
+        finally:
+            session.close()
+
     def get_reddit_posts_missing_extracted_information(
         self, limit: int = 100
     ) -> list[tuple[str, str]]:
@@ -210,6 +625,76 @@ class DAO(Singleton):
         finally:
             session.close()
 
+    def update_reddit_posts_extracted_information_bulk(
+        self, updates: list[tuple[str, str]]
+    ) -> int:
+        """Persist extracted_information of many posts in one executemany.
+
+        Args:
+            updates: (post ID, extracted_information) pairs.
+
+        Returns:
+            Number of updated rows.
+        """
+        if not updates:
+            return 0
+
+        table = RedditPost.__table__
+        statement = (
+            update(table)
+            .where(table.c.id == bindparam("b_id"))
+            .values(extracted_information=bindparam("b_extracted_information"))
+        )
+        try:
+            with self.engine.begin() as connection:
+                result = connection.execute(
+                    statement,
+                    [
+                        {"b_id": post_id, "b_extracted_information": extracted}
+                        for post_id, extracted in updates
+                    ],
+                )
+            return max(result.rowcount, 0)
+        except (ValueError, KeyError, AttributeError):
+            logger.exception(
+                "Failed to update extracted_information of %d reddit posts",
+                len(updates),
+            )
+            return 0
+
+    def filter_existing_ids(self, post_ids: list[str]) -> set[str]:
+        """Return the subset of IDs already stored, in one primary-key query.
+
+        Args:
+            post_ids: Candidate post identifiers, e.g. one listing page.
+
+        Returns:
+            IDs of posts present in the database.
+        """
+        if not post_ids:
+            return set()
+
+        session = self.session_maker()
+        try:
+            rows = (
+                session.query(RedditPost.id)
+                .filter(RedditPost.id.in_(set(post_ids)))
+                .all()
+            )
+            existing = {row[0] for row in rows}
+            logger.info(
+                "Found %d/%d reddit post IDs already stored",
+                len(existing),
+                len(post_ids),
+            )
+            return existing
+        except (ValueError, KeyError, AttributeError):
+            logger.exception("Failed to filter existing reddit post IDs")
+            session.rollback()
+            return set()
+        finally:
+            session.close()
+
     def is_reddit_post_in_db(self, post_id: str) -> bool:
         """Check if a Reddit post exists in the database.
 
@@ -242,3 +727,59 @@ class DAO(Singleton):
         """
         # Generate a unique post ID based on title and author
         return hashlib.md5(f"{title}{author}".encode("utf-8")).hexdigest()
+
+
+class ExtractedInformationWriter:
+    """Buffer extracted_information results and write them by batches.
+
+    Extraction threads call add; the buffer is flushed through one
+    executemany UPDATE once it holds flush_rows results or flush_seconds
+    passed since the last flush. Call flush once the extraction job ends.
+
+    Attributes:
+        dao: DAO the results are written with.
+        flush_rows: Buffered results that trigger a flush.
+        flush_seconds: Age of the last flush that triggers a flush.
+        updated_count: Rows updated by all flushes so far.
+    """
+
+    def __init__(self, dao: DAO, flush_rows: int, flush_seconds: float) -> None:
+        self.dao = dao
+        self.flush_rows = max(flush_rows, 1)
+        self.flush_seconds = flush_seconds
+        self.updated_count = 0
+        self._pending: list[tuple[str, str]] = []
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+
+    def add(self, post_id: str, extracted_information: str) -> None:
+        """Queue one result, flushing when the batch is full or old enough."""
+        with self._lock:
+            self._pending.append((post_id, extracted_information))
+            due = (
+                len(self._pending) >= self.flush_rows
+                or time.monotonic() - self._last_flush >= self.flush_seconds
+            )
+        if due:
+            self.flush()
+
+    def flush(self) -> int:
+        """Write the buffered results; return how many rows were updated."""
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending = self._pending, []
+                self._last_flush = time.monotonic()
+            if not pending:
+                return 0
+
+            start = time.perf_counter()
+            updated = self.dao.update_reddit_posts_extracted_information_bulk(pending)
+            logger.info(
+                "Flushed extracted_information: updated=%d/%d rows in %.1f ms",
+                updated,
+                len(pending),
+                (time.perf_counter() - start) * 1000,
+            )
+            self.updated_count += updated
+            return updated
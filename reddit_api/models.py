@@ -1,6 +1,6 @@
 """SQLAlchemy models for Reddit data storage."""
 
-from sqlalchemy import Column, String, Text, TIMESTAMP
+from sqlalchemy import Column, Integer, String, Text, TIMESTAMP
 from sqlalchemy.orm import declarative_base
 
 Base = declarative_base()
@@ -13,6 +13,10 @@ class RedditPost(Base):  # pylint: disable=too-few-public-methods
         id: Unique post identifier (MD5 hash).
         content_str: The post content including comments.
         date_insertion: Timestamp of when the post was inserted.
+        subreddit: Subreddit the post was scraped from.
+        score: Reddit score of the post when it was scraped.
+        num_comments: Number of comments when the post was scraped.
+        created_utc: Creation time of the post on Reddit (UTC).
     """
 
     __tablename__ = "reddit_posts"
@@ -20,3 +24,7 @@ class RedditPost(Base):  # pylint: disable=too-few-public-methods
     content_str = Column(Text)
     extracted_information = Column(Text, nullable=True)
     date_insertion = Column(TIMESTAMP, nullable=False)
+    subreddit = Column(String(100), nullable=True)
+    score = Column(Integer, nullable=True)
+    num_comments = Column(Integer, nullable=True)
+    created_utc = Column(TIMESTAMP, nullable=True)
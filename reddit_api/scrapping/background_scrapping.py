@@ -1,5 +1,7 @@
 """Background scraping module for collecting Reddit posts."""
 
+import os
+
 from dao import DAO
 from cleantext import clean
 from scrapping import yars
@@ -7,6 +9,11 @@ from logger_config import logger
 
 # Module-level DAO instance (initialized in run())
 DAO_INSTANCE = None  # pylint: disable=invalid-name
+# Scraped posts are written by batches of this size in one transaction
+SCRAPE_INSERT_BATCH_SIZE = int(os.getenv("SCRAPE_INSERT_BATCH_SIZE", "50"))
+# IDs known to be stored, warmed in run(). Each listing page still asks the
+# DB about IDs missing from it, to catch posts written by another process.
+KNOWN_POST_IDS: set[str] = set()
 
 
 def clean_post(post: list[str]) -> list[str]:
@@ -43,6 +50,31 @@ def fetch_post_details(miner: yars.YARS, permalink: str) -> dict:
     return miner.scrape_post_details(permalink)
 
 
+def flush_posts(pending_posts: list[dict]) -> None:
+    """Insert buffered posts in one bulk write and empty the buffer.
+
+    Only IDs confirmed stored are added to KNOWN_POST_IDS, so posts of a
+    failed write are scraped again.
+
+    Args:
+        pending_posts: Posts waiting to be inserted.
+    """
+    if not pending_posts:
+        return
+    post_ids = {
+        DAO_INSTANCE.generate_post_id(title=post["title"], author=post["author"])
+        for post in pending_posts
+    }
+    inserted = DAO_INSTANCE.add_reddit_posts_bulk(pending_posts)
+    if inserted != len(post_ids):
+        # Duplicates and rows the DAO rejected (logged, counted as 0) were not
+        # inserted, so check which rows are really stored. Database errors
+        # propagate and leave the set unchanged.
+        post_ids = DAO_INSTANCE.filter_existing_ids(list(post_ids))
+    KNOWN_POST_IDS.update(post_ids)
+    pending_posts.clear()
+
+
 def process_subreddit_posts(
     miner: yars.YARS, category: str, reddit: str = "JustBuyXEQT"
 ) -> None:
@@ -59,12 +91,22 @@ def process_subreddit_posts(
         reddit, limit=100, category=category, time_filter="all"
     )
 
-    for post_data in subreddit_posts:
-        if not DAO_INSTANCE.is_reddit_post_in_db(
-            DAO_INSTANCE.generate_post_id(
-                title=post_data["title"], author=post_data["author"]
-            )
-        ):
+    post_ids = [
+        DAO_INSTANCE.generate_post_id(
+            title=post_data["title"], author=post_data["author"]
+        )
+        for post_data in subreddit_posts
+    ]
+    # One query for the whole page, limited to IDs not known to be stored
+    KNOWN_POST_IDS.update(
+        DAO_INSTANCE.filter_existing_ids(
+            [post_id for post_id in post_ids if post_id not in KNOWN_POST_IDS]
+        )
+    )
+
+    pending_posts: list[dict] = []
+    for post_id, post_data in zip(post_ids, subreddit_posts):
+        if post_id not in KNOWN_POST_IDS:
             post_details = fetch_post_details(miner, post_data["permalink"])
             if not post_details:
                 logger.warning("No post details returned for permalink=%s", post_data["permalink"])
@@ -83,11 +125,20 @@ def process_subreddit_posts(
                     get_replies(comment, post)
 
             joined_post = "\n Next comment : ".join(clean_post(post))
-            DAO_INSTANCE.add_reddit_post(
-                content_str=joined_post,
-                title=post_data["title"],
-                author=post_data["author"],
+            pending_posts.append(
+                {
+                    "content_str": joined_post,
+                    "title": post_data["title"],
+                    "author": post_data["author"],
+                    "subreddit": post_data.get("subreddit", reddit),
+                    "score": post_data.get("score"),
+                    "num_comments": post_data.get("num_comments"),
+                    "created_utc": post_data.get("created_utc"),
+                }
             )
+            if len(pending_posts) >= SCRAPE_INSERT_BATCH_SIZE:
+                flush_posts(pending_posts)
+    flush_posts(pending_posts)
     logger.info("Finished subreddit=%s category=%s", reddit, category)
 
 
@@ -122,7 +173,9 @@ def run() -> None:
     miner = yars.YARS()
 
     global DAO_INSTANCE  # pylint: disable=global-statement
-    DAO_INSTANCE = DAO.get_instance(force_refresh=True)
+    DAO_INSTANCE = DAO.get_instance()
+    KNOWN_POST_IDS.clear()
+    KNOWN_POST_IDS.update(DAO_INSTANCE.get_reddit_post_ids())
 
     for s in sub:
         for category in categories:
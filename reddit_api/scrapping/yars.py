@@ -168,6 +168,7 @@ class YARS:
                     "score": post_data["score"],
                     "num_comments": post_data["num_comments"],
                     "created_utc": post_data["created_utc"],
+                    "subreddit": post_data.get("subreddit", subreddit),
                 }
                 if post_data.get("post_hint") == "image" and "url" in post_data:
                     post_info["image_url"] = post_data["url"]